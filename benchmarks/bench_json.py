@@ -0,0 +1,69 @@
+"""
+Compares the JSON backends on large search and fingerprint payloads
+
+    python benchmarks/bench_json.py [repeats]
+
+Decoding is measured on a 50 mod SearchModsResponse page and on a fingerprint matches response,
+encoding on a 10,000 fingerprint GetFingerprintMatchesRequestBody and a 5,000 id GetModsByIdsListRequestBody,
+with the jsonpickle based str(body) the request bodies used to go through as a baseline when jsonpickle is installed.
+"""
+import copy
+import json
+import sys
+import timeit
+
+try:
+    import jsonpickle
+except ImportError:
+    jsonpickle = None
+
+import CurseForgeAPy.SchemaClasses as schemas
+from CurseForgeAPy.JsonBackend import BACKENDS, get_json_backend
+from bench_memory import FILE, MOD
+
+def search_payload() -> bytes:
+    mods = []
+    for i in range(50):
+        mod = copy.deepcopy(MOD)
+        mod["id"] += i
+        mod["latestFiles"] = [copy.deepcopy(FILE) for _ in range(6)]
+        mod["latestFilesIndexes"] = mod["latestFilesIndexes"] * 30
+        mods.append(mod)
+    return json.dumps({"data": mods, "pagination": {"index": 0, "pageSize": 50, "resultCount": 50, "totalCount": 10000}}).encode()
+
+def fingerprint_payload() -> bytes:
+    matches = [{"id": 729219 + i, "file": FILE, "latestFiles": [FILE, FILE]} for i in range(500)]
+    fingerprints = list(range(1000000, 1010000))
+    return json.dumps({"data": {
+        "isCacheBuilt": True, "exactMatches": matches, "exactFingerprints": fingerprints[:500], "partialMatches": [],
+        "partialMatchFingerprints": {}, "installedFingerprints": fingerprints, "unmatchedFingerprints": fingerprints[500:],
+    }}).encode()
+
+def main(repeats: int = 20) -> None:
+    backends = []
+    for name in BACKENDS:
+        try:
+            backends.append(get_json_backend(name))
+        except ImportError:
+            print(f"{name}: not installed, skipped")
+
+    payloads = {"search page": search_payload(), "fingerprint matches": fingerprint_payload()}
+    bodies = {
+        "fingerprints body": schemas.GetFingerprintMatchesRequestBody(list(range(1000000, 1010000))),
+        "getMods body": schemas.GetModsByIdsListRequestBody(list(range(5000))),
+    }
+
+    print(f"\n{'decode':<30}" + "".join(f"{b.name:>12}" for b in backends))
+    for label, payload in payloads.items():
+        times = [timeit.timeit(lambda: b.loads(payload), number=repeats) / repeats for b in backends]
+        print(f"{label + f' ({len(payload) // 1024} KB)':<30}" + "".join(f"{t * 1000:>10.2f}ms" for t in times))
+
+    print(f"\n{'encode':<30}" + "".join(f"{b.name:>12}" for b in backends) + (f"{'jsonpickle':>12}" if jsonpickle else ""))
+    for label, body in bodies.items():
+        times = [timeit.timeit(lambda: b.encode(body), number=repeats) / repeats for b in backends]
+        if jsonpickle:
+            times.append(timeit.timeit(lambda: jsonpickle.dumps(body.__dict__, keys=True), number=repeats) / repeats)
+        print(f"{label:<30}" + "".join(f"{t * 1000:>10.2f}ms" for t in times))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,62 @@
+"""
+Memory per Mod and per File for SchemaClasses against CompactSchemaClasses
+
+    python benchmarks/bench_memory.py [count]
+
+Objects are built from a synthetic but realistically shaped API payload and measured with tracemalloc,
+the reported bytes include every nested object (files, hashes, sortable game versions, categories, ...).
+"""
+import copy
+import gc
+import sys
+import tracemalloc
+
+import CurseForgeAPy.SchemaClasses as schemas
+import CurseForgeAPy.CompactSchemaClasses as compact
+
+FILE = {
+    "id": 4159320, "gameId": 432, "modId": 729219, "isAvailable": True, "displayName": "example-1.19.2-1.0.0.jar",
+    "fileName": "example-1.19.2-1.0.0.jar", "releaseType": 1, "fileStatus": 4,
+    "hashes": [{"value": "0f3a6a8a9b8c7d6e5f4a3b2c1d0e9f8a7b6c5d4e", "algo": 1}, {"value": "9e107d9d372bb6826bd81d3542a419d6", "algo": 2}],
+    "fileDate": "2023-01-02T03:04:05.123Z", "fileLength": 1048576, "downloadCount": 123456,
+    "downloadUrl": "https://edge.forgecdn.net/files/4159/320/example-1.19.2-1.0.0.jar", "gameVersions": ["1.19.2", "Forge"],
+    "sortableGameVersions": [{"gameVersionName": "1.19.2", "gameVersionPadded": "0000000001.0000000019.0000000002", "gameVersion": "1.19.2", "gameVersionReleaseDate": "2022-08-05T14:12:22.413Z", "gameVersionTypeId": 73407}],
+    "dependencies": [{"modId": 238222, "relationType": 3}], "fileFingerprint": 2352728825, "modules": [{"name": "META-INF", "fingerprint": 1234567890}],
+}
+
+MOD = {
+    "id": 729219, "gameId": 432, "name": "Example Mod", "slug": "example-mod",
+    "links": {"websiteUrl": "https://www.curseforge.com/minecraft/mc-mods/example-mod", "wikiUrl": "", "issuesUrl": "", "sourceUrl": ""},
+    "summary": "An example mod used to measure object sizes", "status": 4, "downloadCount": 1000000, "isFeatured": False, "primaryCategoryId": 412,
+    "categories": [{"id": 412, "gameId": 432, "name": "Technology", "slug": "technology", "url": "https://www.curseforge.com/minecraft/mc-mods/technology", "iconUrl": "", "dateModified": "2014-05-08T17:44:39.057Z", "isClass": False, "classId": 6, "parentCategoryId": 6}],
+    "classId": 6, "authors": [{"id": 1, "name": "author", "url": "https://www.curseforge.com/members/author"}],
+    "logo": {"id": 1, "modId": 729219, "title": "logo", "description": "", "thumbnailUrl": "", "url": ""}, "screenshots": [],
+    "mainFileId": 4159320, "latestFiles": [FILE],
+    "latestFilesIndexes": [{"gameVersion": "1.19.2", "fileId": 4159320, "filename": "example-1.19.2-1.0.0.jar", "releaseType": 1, "gameVersionTypeId": 73407, "modLoader": 1}],
+    "dateCreated": "2022-01-01T00:00:00Z", "dateModified": "2023-01-02T03:04:05.123Z", "dateReleased": "2023-01-02T03:04:05.123Z",
+    "gamePopularityRank": 100, "isAvailable": True, "thumbsUpCount": 0,
+}
+
+def measure(cls, payload: dict, count: int) -> float:
+    """ average bytes allocated per object of cls built from payload """
+    payloads = [copy.deepcopy(payload) for _ in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [cls(**p) for p in payloads]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # the list holding the objects is not part of their size
+    allocated -= sys.getsizeof(objects)
+    return allocated / count
+
+def main(count: int = 10000) -> None:
+    print(f"{'class':<6} {'SchemaClasses':>15} {'Compact':>10} {'saved':>7}")
+    for name, payload in (("Mod", MOD), ("File", FILE)):
+        regular = measure(getattr(schemas, name), payload, count)
+        slotted = measure(getattr(compact, name), payload, count)
+        print(f"{name:<6} {regular:>13.0f} B {slotted:>8.0f} B {1 - slotted / regular:>6.0%}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,373 @@
+from CurseForgeAPy.CFAPI import ApiResponseError, DEFAULT_MAX_WORKERS, ID_CHUNK_SIZE, _chunk_ids, _merge_chunks, _merge_fingerprint_chunks, _next_page
+from CurseForgeAPy.Endpoints import ENDPOINTS, Endpoint, MAX_PAGE_SIZE, PAGINATION_LIMIT
+from CurseForgeAPy.Memo import ResponseMemo
+from CurseForgeAPy.RateLimiter import RateLimiter
+from CurseForgeAPy.Retry import CircuitBreaker, RetryPolicy
+from CurseForgeAPy.Cache import CachePolicy
+from CurseForgeAPy.JsonBackend import JsonBackend, get_json_backend
+import CurseForgeAPy.CompactSchemaClasses as compactSchemas
+import CurseForgeAPy.SchemaClasses as schemas
+import asyncio
+import time
+
+try:
+    import aiohttp
+    from aiohttp_client_cache import CachedSession
+except ImportError:
+    aiohttp = None
+
+class AsyncCurseForgeAPI(object):
+    """
+    asyncio version of CurseForgeAPI, every endpoint is a coroutine returning the same SchemaClasses objects
+
+    Requires the optional "async" dependencies (pip install CurseForgeAPy[async]).
+
+    All requests share one pooled keep-alive session with an async sqlite cache, so many lookups can be in flight at once:
+
+        async with AsyncCurseForgeAPI('YOUR_API_KEY') as cf:
+            mods = await asyncio.gather(*(cf.getMod(i) for i in modIds))
+    """
+    def __init__(self, api_key, csesh=None, connectionLimit: int = 100, keepaliveTimeout: float = 30, memo: ResponseMemo|None = None, compact: bool = False, jsonBackend: str|JsonBackend = "stdlib", rateLimiter: RateLimiter|None = None, retryPolicy: RetryPolicy|None = None, circuitBreaker: CircuitBreaker|None = None, cachePolicy: CachePolicy|None = None) -> None:
+        if aiohttp is None:
+            raise ImportError("AsyncCurseForgeAPI requires aiohttp and aiohttp-client-cache, install them with: pip install CurseForgeAPy[async]")
+        self.api_key: str = api_key
+        self.base_url: str = "https://api.curseforge.com"
+        self.headers: dict[str, str] = {
+            'Content-Type': 'application/json',
+            "Accept": "application/json",
+            "x-api-key": self.api_key
+        }
+        self.connectionLimit: int = connectionLimit
+        self.keepaliveTimeout: float = keepaliveTimeout
+        self.memo: ResponseMemo|None = memo
+        # the module response objects are built from, CompactSchemaClasses trades per-instance __dict__s for slots
+        self.schemaClasses = compactSchemas if compact else schemas
+        self.json: JsonBackend = get_json_backend(jsonBackend) if isinstance(jsonBackend, str) else jsonBackend
+        # may be shared with a CurseForgeAPI, the limiter is thread safe
+        self.rateLimiter: RateLimiter|None = rateLimiter
+        self.retryPolicy: RetryPolicy|None = retryPolicy
+        self.circuitBreaker: CircuitBreaker|None = circuitBreaker
+        # callables given every response object built from the API, e.g. SearchIndex.observe. They run one after the other
+        # in the loop's default executor, so a slow hook does not stall other requests, and have to be thread safe
+        self.responseHooks: list = []
+        self.cachePolicy: CachePolicy = CachePolicy() if cachePolicy is None else cachePolicy
+        # the session is created lazily so that it binds to the running event loop
+        self.csesh = csesh
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self) -> None:
+        """ close the pooled session, the client can still be used afterwards and will open a new one """
+        if self.csesh is not None:
+            await self.csesh.close()
+            self.csesh = None
+
+    def __session(self):
+        if self.csesh is None or self.csesh.closed:
+            connector = aiohttp.TCPConnector(limit=self.connectionLimit, keepalive_timeout=self.keepaliveTimeout)
+            self.csesh = CachedSession(cache=self.cachePolicy.asyncBackend(), connector=connector)
+        return self.csesh
+
+    async def __cached(self, method: str, url: str, data: str|None):
+        """ the fresh cached response to a request, None when it would have to be sent, looked up the way CachedSession does """
+        session = self.__session()
+        cache = getattr(session, "cache", None)
+        if cache is None or method not in cache.allowed_methods:
+            return None
+        headers = session._prepare_headers(self.headers)
+        key = cache.create_key(method, url, data=data, headers=headers)
+        actions = cache.create_cache_actions(key, url, headers=headers, data=data)
+        if actions.skip_read or actions.revalidate:
+            return None
+        return await cache.request(actions)
+
+    async def __send(self, method: str, url: str, data: str|None, deadline: float|None) -> tuple[int, str|None, bytes|None]|None:
+        """
+        sends a single attempt of a request through the rate limiter, returning its status, Retry-After and the body of OK responses
+
+        None when deadline (time.monotonic) passed before it could be sent
+        """
+        limiter = self.rateLimiter
+        if limiter is not None:
+            # a response the cache can answer on its own does not have to wait for the limiter
+            cached = await self.__cached(method, url, data)
+            if cached is not None:
+                return cached.status, cached.headers.get("Retry-After"), await cached.read() if cached.status == 200 else None
+        if limiter is not None and await limiter.acquireAsync(None if deadline is None else deadline - time.monotonic()) is None:
+            return None
+        timeout = None if deadline is None else deadline - time.monotonic()
+        if timeout is not None and timeout <= 0:
+            # a ClientTimeout of 0 would mean no timeout at all
+            if limiter is not None:
+                limiter.release()
+            return None
+        kwargs = {} if timeout is None else {"timeout": aiohttp.ClientTimeout(total=timeout)}
+        try:
+            async with self.__session().request(method, url, headers=self.headers, data=data, **kwargs) as response:
+                retryAfter = response.headers.get("Retry-After")
+                if limiter is not None:
+                    limiter.release(response.status, retryAfter, getattr(response, "from_cache", False))
+                    limiter = None
+                return response.status, retryAfter, await response.read() if response.status == 200 else None
+        finally:
+            # the request failed before a response arrived
+            if limiter is not None:
+                limiter.release()
+
+    async def __request(self, method: str, url: str, responseClass: type, body=None):
+        data = self.json.encode(body) if body is not None else None
+        if self.memo is not None:
+            key = ResponseMemo.key(method, url, data)
+            cached = self.memo.get(key)
+            if cached is not None:
+                return cached
+
+        policy = self.retryPolicy
+        breaker = self.circuitBreaker
+        started = time.monotonic()
+        deadline = policy.deadlineAt(started) if policy is not None else None
+        attempt = 0
+        while True:
+            attempt += 1
+            if breaker is not None and not breaker.allow():
+                return schemas.ApiResponseCode.ServiceUnavailable
+            try:
+                sent = await self.__send(method, url, data, deadline)
+            except Exception as e:
+                if breaker is not None:
+                    breaker.record(breaker.isFailure(exception=e))
+                retryable = policy is not None and policy.retryable(exception=e)
+                delay = policy.nextDelay(attempt, started) if retryable else None
+                if delay is None:
+                    if retryable and policy.expired(attempt, e):
+                        return schemas.ApiResponseCode.GatewayTimeout
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            if sent is None:
+                if breaker is not None:
+                    breaker.cancel()
+                return schemas.ApiResponseCode.GatewayTimeout
+            status, retryAfter, content = sent
+            if breaker is not None:
+                breaker.record(breaker.isFailure(status))
+            delay = policy.nextDelay(attempt, started, retryAfter) if policy is not None and policy.retryable(status) else None
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+
+        status = schemas.ApiResponseCode(status)
+        if status == schemas.ApiResponseCode.OK:
+            result = getattr(self.schemaClasses, responseClass.__name__)(**self.json.loads(content))
+            if self.memo is not None:
+                self.memo.put(key, result)
+            if self.responseHooks:
+                await asyncio.get_running_loop().run_in_executor(None, self.__run_hooks, result)
+            return result
+        else:
+            return status
+
+    def __run_hooks(self, result) -> None:
+        for hook in self.responseHooks:
+            hook(result)
+
+    async def __call(self, endpoint: Endpoint, body=None, **params):
+        """ bounds checks params, builds the url of endpoint from them and sends the request """
+        if not endpoint.inBounds(params.get("index"), params.get("pageSize")):
+            return schemas.ApiResponseCode.BadRequest
+        return await self.__request(endpoint.method, endpoint.url(self.base_url, **params), endpoint.responseClass, body=body)
+
+    async def __paginate(self, fetch, index: int, pageSize: int, prefetch: bool):
+        """ async version of CurseForgeAPI.__paginate, the next page is requested as a task while the current one is consumed """
+        if not 0 < pageSize <= MAX_PAGE_SIZE:
+            raise ValueError(f"pageSize must be between 1 and {MAX_PAGE_SIZE}")
+        if not 0 <= index < PAGINATION_LIMIT:
+            raise ValueError(f"index must be between 0 and {PAGINATION_LIMIT - 1}")
+        task = None
+        try:
+            pending = (index, min(pageSize, PAGINATION_LIMIT - index))
+            page = await fetch(*pending)
+            while True:
+                if isinstance(page, schemas.ApiResponseCode):
+                    raise ApiResponseError(page)
+                following = _next_page(pending[0], pageSize, page)
+                task = asyncio.ensure_future(fetch(*following)) if prefetch and following else None
+                for item in page.data:
+                    yield item
+                if following is None:
+                    return
+                pending = following
+                page = await task if task else await fetch(*following)
+                task = None
+        finally:
+            if task is not None:
+                task.cancel()
+
+    def iterGames(self, pageSize: int = MAX_PAGE_SIZE, index: int = 0, prefetch: bool = True):
+        """
+        lazily iterate over every game with async for, see CurseForgeAPI.iterGames
+
+        raises ApiResponseError if a page request fails
+        """
+        return self.__paginate(lambda i, size: self.getGames(index=i, pageSize=size), index, pageSize, prefetch)
+
+    def iterSearchMods(self, gameId: int, classId: int|None = None, categoryId: int|None = None, gameVersion: str|None = None, searchFilter: str|None = None, sortField: schemas.ModSearchSortField|None = None, sortOrder: schemas.SortOrder|None = None, modLoaderType: schemas.ModLoaderType|None = None, gameVersionTypeId: int|None = None, slug: str|None = None, pageSize: int = MAX_PAGE_SIZE, index: int = 0, prefetch: bool = True):
+        """
+        lazily iterate over every mod matching the search with async for, see CurseForgeAPI.iterSearchMods
+
+        raises ApiResponseError if a page request fails
+        """
+        def fetch(i: int, size: int):
+            return self.searchMods(gameId, classId, categoryId, gameVersion, searchFilter, sortField, sortOrder, modLoaderType, gameVersionTypeId, slug, index=i, pageSize=size)
+        return self.__paginate(fetch, index, pageSize, prefetch)
+
+    def iterModFiles(self, modId: int, gameVersion: int|None = None, modLoaderType: schemas.ModLoaderType|None = None, gameVersionTypeId: int|None = None, pageSize: int = MAX_PAGE_SIZE, index: int = 0, prefetch: bool = True):
+        """
+        lazily iterate over every file of a mod with async for, see CurseForgeAPI.iterModFiles
+
+        raises ApiResponseError if a page request fails
+        """
+        def fetch(i: int, size: int):
+            return self.getModFiles(modId, gameVersion, modLoaderType, gameVersionTypeId, index=i, pageSize=size)
+        return self.__paginate(fetch, index, pageSize, prefetch)
+
+    async def getGames(self, index: int|None = None, pageSize: int|None = None) -> schemas.GetGamesResponse|schemas.ApiResponseCode:
+        """
+        get all games from CurseForge
+
+        index: A zero based index of the first item to include in the response, the limit is: (index + pageSize <= 10,000).
+
+        pageSize: The number of items to include in the response, the default/maximum value is 50.
+
+        returns GetGamesResponse
+        """
+        return await self.__call(ENDPOINTS["getGames"], index=index, pageSize=pageSize)
+
+    async def getGame(self, gameId: int) -> schemas.GetGameResponse|schemas.ApiResponseCode:
+        """
+        Get a specific game from CurseForge
+
+        gameId: The id of the game to get
+
+        returns GetGameResponse
+        """
+        return await self.__call(ENDPOINTS["getGame"], gameId=gameId)
+
+    async def getVersions(self, gameId: int) -> schemas.GetVersionsResponse|schemas.ApiResponseCode:
+        """
+        Get all versions for a specific game
+
+        gameId: The id of the game to get versions for
+
+        returns GetVersionsResponse
+        """
+        return await self.__call(ENDPOINTS["getVersions"], gameId=gameId)
+
+    async def getVersionTypes(self, gameId: int) -> schemas.GetVersionTypesResponse|schemas.ApiResponseCode:
+        """
+        Get all version types for a specific game
+
+        gameId: The id of the game to get version types for
+
+        returns GetVersionTypesResponse
+        """
+        return await self.__call(ENDPOINTS["getVersionTypes"], gameId=gameId)
+
+    async def getCategories(self, gameId: int, classId: int|None = None, classesOnly: bool|None = None) -> schemas.GetCategoriesResponse|schemas.ApiResponseCode:
+        """
+        Get all categories for a specific game
+
+        gameId: The id of the game to get categories for
+        classId: A unique class ID
+        classesOnly: A flag used with gameId to return only classes
+
+        returns GetCategoriesResponse
+        """
+        return await self.__call(ENDPOINTS["getCategories"], gameId=gameId, classId=classId, classesOnly=classesOnly)
+
+    async def searchMods(self, gameId: int, classId: int|None = None, categoryId: int|None = None, gameVersion: str|None = None, searchFilter: str|None = None, sortField: schemas.ModSearchSortField|None = None, sortOrder: schemas.SortOrder|None = None, modLoaderType: schemas.ModLoaderType|None = None, gameVersionTypeId: int|None = None, slug: str|None = None, index: int|None = None, pageSize: int|None = None) -> schemas.SearchModsResponse|schemas.ApiResponseCode:
+        """
+        searches for mods using the given parameters, see CurseForgeAPI.searchMods for the parameters
+
+        returns SearchModsResponse
+        """
+        return await self.__call(ENDPOINTS["searchMods"], gameId=gameId, classId=classId, categoryId=categoryId, gameVersion=gameVersion, searchFilter=searchFilter, sortField=sortField, sortOrder=sortOrder, modLoaderType=modLoaderType, gameVersionTypeId=gameVersionTypeId, slug=slug, index=index, pageSize=pageSize)
+
+    async def getMod(self, modId: int) -> schemas.GetModResponse|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getMod"], modId=modId)
+
+    async def __fan_out(self, post, chunks: list[list[int]], maxWorkers: int) -> list:
+        """ awaits post on every chunk with at most maxWorkers in flight, returning the responses in chunk order """
+        semaphore = asyncio.Semaphore(max(1, maxWorkers))
+        async def bounded(chunk: list[int]):
+            async with semaphore:
+                return await post(chunk)
+        return await asyncio.gather(*map(bounded, chunks))
+
+    async def __post_mods(self, modIds: list[int]) -> schemas.GetModsResponse|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getMods"], body=schemas.GetModsByIdsListRequestBody(modIds))
+
+    async def getMods(self, modIds: schemas.GetModsByIdsListRequestBody|list[int], chunkSize: int = ID_CHUNK_SIZE, maxWorkers: int = DEFAULT_MAX_WORKERS) -> schemas.GetModsResponse|schemas.ApiResponseCode:
+        """ get any number of mods from their ids, see CurseForgeAPI.getMods for chunking and ordering """
+        if isinstance(modIds, schemas.GetModsByIdsListRequestBody):
+            modIds = modIds.modIds
+        chunks = _chunk_ids(modIds, chunkSize)
+        merged = _merge_chunks(chunks, await self.__fan_out(self.__post_mods, chunks, maxWorkers))
+        return merged if isinstance(merged, schemas.ApiResponseCode) else self.schemaClasses.GetModsResponse(merged)
+
+    async def getFeatured_mods(self, body: schemas.GetFeaturedModsRequestBody) -> schemas.GetFeaturedModsResponse|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getFeatured_mods"], body=body)
+
+    async def getModDescription(self, modId: int) -> schemas.StringResponse|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getModDescription"], modId=modId)
+
+    async def getModFile(self, modId: int, fileId: int) -> schemas.GetModFileResponse|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getModFile"], modId=modId, fileId=fileId)
+
+    async def getModFiles(self, modId: int, gameVersion: int|None = None, modLoaderType: schemas.ModLoaderType|None = None, gameVersionTypeId: int|None = None, index: int|None = None, pageSize: int|None = None) -> schemas.GetModFilesResponse|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getModFiles"], modId=modId, gameVersion=gameVersion, modLoaderType=modLoaderType, gameVersionTypeId=gameVersionTypeId, index=index, pageSize=pageSize)
+
+    async def __post_files(self, fileIds: list[int]) -> schemas.GetFilesResponse|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getFiles"], body=schemas.GetModFilesRequestBody(fileIds))
+
+    async def getFiles(self, body: schemas.GetModFilesRequestBody|list[int], chunkSize: int = ID_CHUNK_SIZE, maxWorkers: int = DEFAULT_MAX_WORKERS) -> schemas.GetFilesResponse|schemas.ApiResponseCode:
+        """ get any number of files from their ids, see CurseForgeAPI.getFiles for chunking and ordering """
+        fileIds = body.fileIds if isinstance(body, schemas.GetModFilesRequestBody) else body
+        chunks = _chunk_ids(fileIds, chunkSize)
+        merged = _merge_chunks(chunks, await self.__fan_out(self.__post_files, chunks, maxWorkers))
+        return merged if isinstance(merged, schemas.ApiResponseCode) else self.schemaClasses.GetFilesResponse(merged)
+
+    async def getModFileChangelog(self, modId: int, fileId: int) -> schemas.StringResponse|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getModFileChangelog"], modId=modId, fileId=fileId)
+
+    async def getModFileDownloadUrl(self, modId: int, fileId: int) -> schemas.StringResponse|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getModFileDownloadUrl"], modId=modId, fileId=fileId)
+
+    async def __post_fingerprints(self, fingerprints: list[int]) -> schemas.GetFingerprintMatchesResponse|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getFingerprintsMatches"], body=schemas.GetFingerprintMatchesRequestBody(fingerprints))
+
+    async def getFingerprintsMatches(self, body: schemas.GetFingerprintMatchesRequestBody|list[int], chunkSize: int = ID_CHUNK_SIZE, maxWorkers: int = DEFAULT_MAX_WORKERS) -> schemas.GetFingerprintMatchesResponse|schemas.ApiResponseCode:
+        """ get the files matching any number of fingerprints, see CurseForgeAPI.getFingerprintsMatches for chunking and merging """
+        fingerprints = body.fingerprints if isinstance(body, schemas.GetFingerprintMatchesRequestBody) else body
+        chunks = _chunk_ids(fingerprints, chunkSize)
+        merged = _merge_fingerprint_chunks(await self.__fan_out(self.__post_fingerprints, chunks, maxWorkers), self.schemaClasses)
+        return merged if isinstance(merged, schemas.ApiResponseCode) else self.schemaClasses.GetFingerprintMatchesResponse(merged)
+
+    async def getFingerprintsFuzzyMatches(self, body: schemas.GetFuzzyMatchesRequestBody) -> schemas.GetFingerprintsFuzzyMatchesResponse|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getFingerprintsFuzzyMatches"], body=body)
+
+    async def getMinecraftVersions(self, sortDescending: bool|None = None) -> schemas.ApiResponseOfListOfMinecraftGameVersion|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getMinecraftVersions"], sortDescending=sortDescending)
+
+    async def getSpecificMinecraftVersion(self, version: str) -> schemas.ApiResponseOfMinecraftGameVersion|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getSpecificMinecraftVersion"], version=version)
+
+    async def getMinecraftModloaders(self, version: str|None = None, includeAll: bool|None = None) -> schemas.ApiResponseOfListOfMinecraftModLoaderIndex|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getMinecraftModloaders"], version=version, includeAll=includeAll)
+
+    async def getSpecificMinecraftModloader(self, modLoaderName: str) -> schemas.ApiResponseOfMinecraftModLoaderVersion|schemas.ApiResponseCode:
+        return await self.__call(ENDPOINTS["getSpecificMinecraftModloader"], modLoaderName=modLoaderName)
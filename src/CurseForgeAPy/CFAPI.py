@@ -1,12 +1,102 @@
-from datetime import datetime
-from requests.utils import quote
-import sys
 import CurseForgeAPy.SchemaClasses as schemas
-import enum
-import requests_cache as rqc
+import requests
+import time
+from requests_cache import CacheMixin
+from concurrent.futures import ThreadPoolExecutor
+from CurseForgeAPy.Coalescer import RequestCoalescer
+from CurseForgeAPy.Memo import ResponseMemo
+from CurseForgeAPy.RateLimiter import RateLimiter
+from CurseForgeAPy.Retry import CircuitBreaker, RetryPolicy
+from CurseForgeAPy.Cache import CachePolicy
+from CurseForgeAPy.JsonBackend import JsonBackend, get_json_backend
+from CurseForgeAPy.Endpoints import ENDPOINTS, Endpoint, MAX_PAGE_SIZE, PAGINATION_LIMIT
+import CurseForgeAPy.CompactSchemaClasses as compactSchemas
+
+# getMods/getFiles/getFingerprintsMatches split their id lists into requests of at most this many ids
+ID_CHUNK_SIZE = 500
+DEFAULT_MAX_WORKERS = 4
+
+class ApiResponseError(Exception):
+    """ raised by the iter* helpers, which cannot return an ApiResponseCode mid-iteration """
+    def __init__(self, status: schemas.ApiResponseCode) -> None:
+        super().__init__(f"CurseForge API returned {status.name} ({status.value})")
+        self.status: schemas.ApiResponseCode = status
+
+def _next_page(index: int, pageSize: int, page) -> tuple[int, int]|None:
+    """ returns the (index, pageSize) of the page after page, or None when page was the last reachable one """
+    nextIndex = index + len(page.data)
+    if not page.data or nextIndex >= min(page.pagination.totalCount, PAGINATION_LIMIT):
+        return None
+    return nextIndex, min(pageSize, PAGINATION_LIMIT - nextIndex)
+
+def _chunk_ids(ids: list[int], chunkSize: int) -> list[list[int]]:
+    """ deduplicates ids, keeping their first occurrence, and splits them into lists of at most chunkSize """
+    if chunkSize < 1:
+        raise ValueError("chunkSize must be at least 1")
+    ids = list(dict.fromkeys(map(int, ids)))
+    return [ids[i:i + chunkSize] for i in range(0, len(ids), chunkSize)]
+
+def _merge_chunks(chunks: list[list[int]], responses: list) -> list|schemas.ApiResponseCode:
+    """ merges the data of each chunk response back into the order of the requested ids, ids the API did not return are left out """
+    byId = {}
+    for response in responses:
+        if isinstance(response, schemas.ApiResponseCode):
+            return response
+        for item in response.data:
+            byId[item.id] = item
+    return [byId[i] for chunk in chunks for i in chunk if i in byId]
+
+def _merge_fingerprint_chunks(responses: list, schemaClasses=schemas) -> schemas.FingerprintsMatchesResult|schemas.ApiResponseCode:
+    """ merges the FingerprintsMatchesResult of every chunk into one, built from schemaClasses, each match and fingerprint appearing once """
+    matches = {}
+    partial = {}
+    partialFingerprints = {}
+    exact = {}
+    installed = {}
+    unmatched = {}
+    isCacheBuilt = True
+    for response in responses:
+        if isinstance(response, schemas.ApiResponseCode):
+            return response
+        result = response.data
+        isCacheBuilt = isCacheBuilt and result.isCacheBuilt
+        for match in result.exactMatches:
+            matches.setdefault((match.id, match.file.id), match)
+        for match in result.partialMatches:
+            partial.setdefault((match.id, match.file.id), match)
+        for key, fingerprints in (result.partialMatchFingerprints or {}).items():
+            partialFingerprints.setdefault(key, {}).update(dict.fromkeys(fingerprints))
+        exact.update(dict.fromkeys(result.exactFingerprints))
+        installed.update(dict.fromkeys(result.installedFingerprints))
+        unmatched.update(dict.fromkeys(result.unmatchedFingerprints))
+    # a fingerprint matched by any chunk is not unmatched, even if another chunk reported it so
+    unmatched = [fingerprint for fingerprint in unmatched if fingerprint not in exact]
+    partialFingerprints = {key: list(fingerprints) for key, fingerprints in partialFingerprints.items()}
+    return schemaClasses.FingerprintsMatchesResult(isCacheBuilt, list(matches.values()), list(exact), list(partial.values()), partialFingerprints, list(installed), unmatched)
 
 class CurseForgeAPI(object):
-    def __init__(self, api_key, csesh=None) -> None:
+    def __init__(self, api_key, csesh=None, coalesceWindow: float|None = None, memo: ResponseMemo|None = None, compact: bool = False, jsonBackend: str|JsonBackend = "stdlib", rateLimiter: RateLimiter|None = None, retryPolicy: RetryPolicy|None = None, circuitBreaker: CircuitBreaker|None = None, cachePolicy: CachePolicy|None = None) -> None:
+        """
+        api_key: your CurseForge API key
+
+        csesh: the session used for requests, defaults to a requests_cache CachedSession built from cachePolicy
+
+        coalesceWindow: when set, getMod and getModFile calls made from any thread within this many seconds of each other are merged into a single getMods/getFiles request
+
+        memo: when set, successful responses are kept as already built objects and repeated requests are answered from memory
+
+        compact: build responses from CompactSchemaClasses, whose slotted objects use far less memory when kept around in bulk
+
+        jsonBackend: the JSON implementation for responses and request bodies, "stdlib", "orjson", "ujson" or "auto" for the fastest installed one
+
+        rateLimiter: when set, every request the cache cannot answer waits for a token and a concurrency slot of it, and 429 responses pause those requests for their Retry-After
+
+        retryPolicy: when set, requests failing with a retryable status or exception are sent again with exponential backoff
+
+        circuitBreaker: when set, requests fail fast with ApiResponseCode.ServiceUnavailable while the API keeps failing
+
+        cachePolicy: the per-endpoint cache TTLs and cache backend, defaults to CachePolicy() (sqlite, reference data cached for a day)
+        """
         self.api_key: str = api_key
         self.base_url: str = "https://api.curseforge.com"
         self.headers: dict[str, str] = {
@@ -14,18 +104,182 @@ class CurseForgeAPI(object):
             "Accept": "application/json",
             "x-api-key": self.api_key
         }
-        self.csesh = rqc.CachedSession("CurseForgeAPY-Cache", backend="sqlite", expire_after=300) if csesh is None else csesh
+        self.cachePolicy: CachePolicy = CachePolicy() if cachePolicy is None else cachePolicy
+        self.csesh = self.cachePolicy.session() if csesh is None else csesh
+        # file downloads bypass the response cache, their bodies would only bloat it
+        self.downloadSession: requests.Session = requests.Session()
+        self.memo: ResponseMemo|None = memo
+        # the module response objects are built from, CompactSchemaClasses trades per-instance __dict__s for slots
+        self.schemaClasses = compactSchemas if compact else schemas
+        self.json: JsonBackend = get_json_backend(jsonBackend) if isinstance(jsonBackend, str) else jsonBackend
+        self.rateLimiter: RateLimiter|None = rateLimiter
+        self.retryPolicy: RetryPolicy|None = retryPolicy
+        self.circuitBreaker: CircuitBreaker|None = circuitBreaker
+        # callables given every response object built from the API, e.g. SearchIndex.observe, they run on the requesting thread
+        self.responseHooks: list = []
+        self.modCoalescer: RequestCoalescer|None = None
+        self.fileCoalescer: RequestCoalescer|None = None
+        if coalesceWindow is not None:
+            self.modCoalescer = RequestCoalescer(self.__load_mods, coalesceWindow, ID_CHUNK_SIZE, schemas.ApiResponseCode.NotFound)
+            self.fileCoalescer = RequestCoalescer(self.__load_mod_files, coalesceWindow, ID_CHUNK_SIZE, schemas.ApiResponseCode.NotFound)
+
+    def __send(self, method: str, url: str, data: str|None, deadline: float|None):
+        """ sends a single attempt of a request, through the rate limiter when there is one, None when deadline (time.monotonic) passed before it could be """
+        limiter = self.rateLimiter
+        if limiter is not None and isinstance(self.csesh, CacheMixin):
+            # a response the cache can answer on its own does not have to wait for the limiter
+            cached = self.csesh.request(method, url, headers=self.headers, data=data, only_if_cached=True)
+            # a miss comes back as a 504 made up by requests_cache
+            if getattr(cached, "from_cache", False) and cached.status_code != 504:
+                return cached
+        if limiter is not None and limiter.acquire(None if deadline is None else deadline - time.monotonic()) is None:
+            return None
+        timeout = None if deadline is None else deadline - time.monotonic()
+        if timeout is not None and timeout <= 0:
+            # requests rejects a timeout of 0
+            if limiter is not None:
+                limiter.release()
+            return None
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        if limiter is None:
+            return self.csesh.request(method, url, headers=self.headers, data=data, **kwargs)
+        try:
+            response = self.csesh.request(method, url, headers=self.headers, data=data, **kwargs)
+        except BaseException:
+            limiter.release()
+            raise
+        limiter.release(response.status_code, response.headers.get("Retry-After"), getattr(response, "from_cache", False))
+        return response
+
+    def __request(self, method: str, url: str, responseClass: type, body=None):
+        """ sends the request and builds responseClass from the response, returning the ApiResponseCode on failure """
+        data = self.json.encode(body) if body is not None else None
+        if self.memo is not None:
+            key = ResponseMemo.key(method, url, data)
+            cached = self.memo.get(key)
+            if cached is not None:
+                return cached
+
+        policy = self.retryPolicy
+        breaker = self.circuitBreaker
+        started = time.monotonic()
+        deadline = policy.deadlineAt(started) if policy is not None else None
+        attempt = 0
+        while True:
+            attempt += 1
+            if breaker is not None and not breaker.allow():
+                return schemas.ApiResponseCode.ServiceUnavailable
+            try:
+                response = self.__send(method, url, data, deadline)
+            except Exception as e:
+                if breaker is not None:
+                    breaker.record(breaker.isFailure(exception=e))
+                retryable = policy is not None and policy.retryable(exception=e)
+                delay = policy.nextDelay(attempt, started) if retryable else None
+                if delay is None:
+                    if retryable and policy.expired(attempt, e):
+                        return schemas.ApiResponseCode.GatewayTimeout
+                    raise
+                time.sleep(delay)
+                continue
+            if response is None:
+                if breaker is not None:
+                    breaker.cancel()
+                return schemas.ApiResponseCode.GatewayTimeout
+            if breaker is not None:
+                breaker.record(breaker.isFailure(response.status_code))
+            delay = policy.nextDelay(attempt, started, response.headers.get("Retry-After")) if policy is not None and policy.retryable(response.status_code) else None
+            if delay is None:
+                break
+            time.sleep(delay)
+
+        status = schemas.ApiResponseCode(response.status_code)
+
+        if status == schemas.ApiResponseCode.OK:
+            result = getattr(self.schemaClasses, responseClass.__name__)(**self.json.loads(response.content))
+            if self.memo is not None:
+                self.memo.put(key, result)
+            for hook in self.responseHooks:
+                hook(result)
+            return result
+        else:
+            return status
+
+    def __load_mods(self, modIds: list[int]) -> dict[int, schemas.GetModResponse|schemas.ApiResponseCode]:
+        """ batch function of modCoalescer """
+        response = self.getMods(modIds)
+        if isinstance(response, schemas.ApiResponseCode):
+            return dict.fromkeys(modIds, response)
+        return {mod.id: self.schemaClasses.GetModResponse(mod) for mod in response.data}
+
+    def __load_mod_files(self, keys: list[tuple[int, int]]) -> dict[tuple[int, int], schemas.GetModFileResponse|schemas.ApiResponseCode]:
+        """ batch function of fileCoalescer, keyed by (modId, fileId) so a file only resolves for the mod it belongs to """
+        response = self.getFiles([fileId for _, fileId in keys])
+        if isinstance(response, schemas.ApiResponseCode):
+            return dict.fromkeys(keys, response)
+        return {(file.modId, file.id): self.schemaClasses.GetModFileResponse(file) for file in response.data}
+
+    def __call(self, endpoint: Endpoint, body=None, **params):
+        """ bounds checks params, builds the url of endpoint from them and sends the request """
+        if not endpoint.inBounds(params.get("index"), params.get("pageSize")):
+            return schemas.ApiResponseCode.BadRequest
+        return self.__request(endpoint.method, endpoint.url(self.base_url, **params), endpoint.responseClass, body=body)
+
+    def __paginate(self, fetch, index: int, pageSize: int, prefetch: bool):
+        """ yields every item of every page returned by fetch(index, pageSize), requesting the next page in the background while the current one is consumed """
+        if not 0 < pageSize <= MAX_PAGE_SIZE:
+            raise ValueError(f"pageSize must be between 1 and {MAX_PAGE_SIZE}")
+        if not 0 <= index < PAGINATION_LIMIT:
+            raise ValueError(f"index must be between 0 and {PAGINATION_LIMIT - 1}")
+        pool = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            pending = (index, min(pageSize, PAGINATION_LIMIT - index))
+            page = fetch(*pending)
+            while True:
+                if isinstance(page, schemas.ApiResponseCode):
+                    raise ApiResponseError(page)
+                following = _next_page(pending[0], pageSize, page)
+                future = pool.submit(fetch, *following) if pool and following else None
+                yield from page.data
+                if following is None:
+                    return
+                pending = following
+                page = future.result() if future else fetch(*following)
+        finally:
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def iterGames(self, pageSize: int = MAX_PAGE_SIZE, index: int = 0, prefetch: bool = True):
+        """
+        lazily iterate over every game, fetching pages of pageSize as needed
 
-    def __query_builder(self, func, *params):
-        assert type(func) == type(self.getGames), "func must be a function"
+        prefetch: request the next page in the background while the current one is being consumed
 
-        values = {}
-        for i,v in enumerate(params):
-            if v is not None:
-                if isinstance(v, enum.Enum):
-                    v = v.value
-                values[func.__code__.co_varnames[:func.__code__.co_argcount][i+1]] = v
-        return "?" + "&".join([quote(f"{k}={v}", safe="=") for k, v in values.items()])
+        raises ApiResponseError if a page request fails
+        """
+        return self.__paginate(lambda i, size: self.getGames(index=i, pageSize=size), index, pageSize, prefetch)
+
+    def iterSearchMods(self, gameId: int, classId: int|None = None, categoryId: int|None = None, gameVersion: str|None = None, searchFilter: str|None = None, sortField: schemas.ModSearchSortField|None = None, sortOrder: schemas.SortOrder|None = None, modLoaderType: schemas.ModLoaderType|None = None, gameVersionTypeId: int|None = None, slug: str|None = None, pageSize: int = MAX_PAGE_SIZE, index: int = 0, prefetch: bool = True):
+        """
+        lazily iterate over every mod matching the search, takes the same filters as searchMods
+
+        Iteration stops at pagination.totalCount or at the 10,000 item pagination limit, whichever comes first.
+
+        raises ApiResponseError if a page request fails
+        """
+        def fetch(i: int, size: int):
+            return self.searchMods(gameId, classId, categoryId, gameVersion, searchFilter, sortField, sortOrder, modLoaderType, gameVersionTypeId, slug, index=i, pageSize=size)
+        return self.__paginate(fetch, index, pageSize, prefetch)
+
+    def iterModFiles(self, modId: int, gameVersion: int|None = None, modLoaderType: schemas.ModLoaderType|None = None, gameVersionTypeId: int|None = None, pageSize: int = MAX_PAGE_SIZE, index: int = 0, prefetch: bool = True):
+        """
+        lazily iterate over every file of a mod, takes the same filters as getModFiles
+
+        raises ApiResponseError if a page request fails
+        """
+        def fetch(i: int, size: int):
+            return self.getModFiles(modId, gameVersion, modLoaderType, gameVersionTypeId, index=i, pageSize=size)
+        return self.__paginate(fetch, index, pageSize, prefetch)
 
     def getGames(self, index: int|None = None, pageSize: int|None = None) -> schemas.GetGamesResponse|schemas.ApiResponseCode:
         """
@@ -37,34 +291,7 @@ class CurseForgeAPI(object):
         
         returns GetGamesResponse
         """
-        # region init
-        # region bounds checking
-        if index is not None:
-            if not 0 <= index <= 10000:
-                return schemas.ApiResponseCode.BadRequest
-        if pageSize is not None:
-            if not 0 <= pageSize <= 50:
-                return schemas.ApiResponseCode.BadRequest
-        if index is not None and pageSize is not None:
-            if not index + pageSize <= 10000:
-                return schemas.ApiResponseCode.BadRequest
-        # endregion
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/games{self.__query_builder(this, *lvars)}"
-        # endregion
-        
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetGamesResponse(**response.json())
-        else:
-            return status
+        return self.__call(ENDPOINTS["getGames"], index=index, pageSize=pageSize)
 
     def getGame(self, gameId: int) -> schemas.GetGameResponse|schemas.ApiResponseCode:
         """
@@ -75,23 +302,7 @@ class CurseForgeAPI(object):
         returns GetGameResponse
         """
 
-        # region init
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/games/{gameId}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetGameResponse(**response.json())
-        else:
-            return status
+        return self.__call(ENDPOINTS["getGame"], gameId=gameId)
 
     def getVersions(self, gameId: int) -> schemas.GetVersionsResponse|schemas.ApiResponseCode:
         """
@@ -102,17 +313,7 @@ class CurseForgeAPI(object):
         returns GetVersionsResponse
         """
         
-        # region init
-        url = self.base_url + f"/v1/games/{gameId}/versions"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetVersionsResponse(**response.json())
-        else:
-            return status
+        return self.__call(ENDPOINTS["getVersions"], gameId=gameId)
 
     def getVersionTypes(self, gameId: int) -> schemas.GetVersionTypesResponse|schemas.ApiResponseCode:
         """
@@ -123,17 +324,7 @@ class CurseForgeAPI(object):
         returns GetVersionTypesResponse
         """
 
-        # region init
-        url = self.base_url + f"/v1/games/{gameId}/version-types"
-        # endregion
-        
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetVersionTypesResponse(**response.json())
-        else:
-            return status
+        return self.__call(ENDPOINTS["getVersionTypes"], gameId=gameId)
 
     def getCategories(self, gameId: int, classId: int|None = None, classesOnly: bool|None = None) -> schemas.GetCategoriesResponse|schemas.ApiResponseCode:
         """
@@ -146,23 +337,7 @@ class CurseForgeAPI(object):
         returns GetCategoriesResponse
         """
 
-        # region init
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/games/{gameId}/version-types"
-        # endregion
-        
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetCategoriesResponse(**response.json())
-        else:
-            return status
+        return self.__call(ENDPOINTS["getCategories"], gameId=gameId, classId=classId, classesOnly=classesOnly)
 
     def searchMods(self, gameId: int, classId: int|None = None, categoryId: int|None = None, gameVersion: str|None = None, searchFilter: str|None = None, sortField: schemas.ModSearchSortField|None = None, sortOrder: schemas.SortOrder|None = None, modLoaderType: schemas.ModLoaderType|None = None, gameVersionTypeId: int|None = None, slug: str|None = None, index: int|None = None, pageSize: int|None = None) -> schemas.SearchModsResponse|schemas.ApiResponseCode:
         """
@@ -188,253 +363,114 @@ class CurseForgeAPI(object):
 
         """
         
-        # region init
-        # region bounds checking
-        if index is not None:
-            if not 0 <= index <= 10000:
-                return schemas.ApiResponseCode.BadRequest
-        if pageSize is not None:
-            if not 0 <= pageSize <= 50:
-                return schemas.ApiResponseCode.BadRequest
-        if index is not None and pageSize is not None:
-            if not index + pageSize <= 10000:
-                return schemas.ApiResponseCode.BadRequest
-        # endregion
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/mods/search{self.__query_builder(this, *lvars)}"
-        # endregion
-        
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.SearchModsResponse(**response.json())
-        else:
-            return status
+        return self.__call(ENDPOINTS["searchMods"], gameId=gameId, classId=classId, categoryId=categoryId, gameVersion=gameVersion, searchFilter=searchFilter, sortField=sortField, sortOrder=sortOrder, modLoaderType=modLoaderType, gameVersionTypeId=gameVersionTypeId, slug=slug, index=index, pageSize=pageSize)
 
     def getMod(self, modId: int) -> schemas.GetModResponse|schemas.ApiResponseCode:
-        # region init
-        url = self.base_url + f"/v1/mods/{modId}"
-        # endregion
+        if self.modCoalescer is not None:
+            return self.modCoalescer.load(int(modId))
 
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
+        return self.__call(ENDPOINTS["getMod"], modId=modId)
 
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetModResponse(**response.json())
-        else:
-            return status
+    def __fan_out(self, post, chunks: list[list[int]], maxWorkers: int) -> list:
+        """ calls post on every chunk, concurrently when there is more than one, and returns the responses in chunk order """
+        if len(chunks) <= 1 or maxWorkers <= 1:
+            return list(map(post, chunks))
+        with ThreadPoolExecutor(max_workers=min(maxWorkers, len(chunks))) as pool:
+            return list(pool.map(post, chunks))
 
-    def getMods(self, modIds: schemas.GetModsByIdsListRequestBody|list[int]) -> schemas.GetModsResponse|schemas.ApiResponseCode:
-        # region init
-        url = self.base_url + f"/v1/mods"
-        # endregion
+    def __post_mods(self, modIds: list[int]) -> schemas.GetModsResponse|schemas.ApiResponseCode:
+        return self.__call(ENDPOINTS["getMods"], body=schemas.GetModsByIdsListRequestBody(modIds))
 
-        if isinstance(modIds, list):
-            modIds = schemas.GetModsByIdsListRequestBody(modIds)
-        response = self.csesh.post(url, headers=self.headers, data=str(modIds))
-        status = schemas.ApiResponseCode(response.status_code)
+    def getMods(self, modIds: schemas.GetModsByIdsListRequestBody|list[int], chunkSize: int = ID_CHUNK_SIZE, maxWorkers: int = DEFAULT_MAX_WORKERS) -> schemas.GetModsResponse|schemas.ApiResponseCode:
+        """
+        get a list of mods from their ids
 
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetModsResponse(**response.json())
-        else:
-            return status
+        modIds: any number of mod ids, duplicates are only requested once
 
-    def getFeatured_mods(self, body: schemas.GetFeaturedModsRequestBody) -> schemas.GetFeaturedModsResponse|schemas.ApiResponseCode:        
-        # region init
-        # endregion
-        response = self.csesh.post(self.base_url+'/v1/mods/featured', headers=self.headers, data=str(body))
-        
-        status = schemas.ApiResponseCode(response.status_code)
+        chunkSize: the maximum number of ids sent in a single request
 
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetFeaturedModsResponse(**response.json())
-        else:
-            return status
+        maxWorkers: how many chunk requests may be in flight at once
 
-    def getModDescription(self, modId: int) -> schemas.StringResponse|schemas.ApiResponseCode:
-        # region init
-        url = self.base_url + f"/v1/mods/{modId}/description"
-        # endregion
+        returns GetModsResponse with the mods in the order of modIds, or the status of the first failed chunk
+        """
+        if isinstance(modIds, schemas.GetModsByIdsListRequestBody):
+            modIds = modIds.modIds
+        chunks = _chunk_ids(modIds, chunkSize)
+        merged = _merge_chunks(chunks, self.__fan_out(self.__post_mods, chunks, maxWorkers))
+        return merged if isinstance(merged, schemas.ApiResponseCode) else self.schemaClasses.GetModsResponse(merged)
 
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
+    def getFeatured_mods(self, body: schemas.GetFeaturedModsRequestBody) -> schemas.GetFeaturedModsResponse|schemas.ApiResponseCode:        
+        return self.__call(ENDPOINTS["getFeatured_mods"], body=body)
 
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.StringResponse(**response.json())
-        else:
-            return status
+    def getModDescription(self, modId: int) -> schemas.StringResponse|schemas.ApiResponseCode:
+        return self.__call(ENDPOINTS["getModDescription"], modId=modId)
     
     def getModFile(self, modId: int, fileId: int) -> schemas.GetModFileResponse|schemas.ApiResponseCode:
-        # region init
-        url = self.base_url + f"/v1/mods/{modId}/files/{fileId}"
-        # endregion
+        if self.fileCoalescer is not None:
+            return self.fileCoalescer.load((int(modId), int(fileId)))
 
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetModFileResponse(**response.json())
-        else:
-            return status
+        return self.__call(ENDPOINTS["getModFile"], modId=modId, fileId=fileId)
     
     def getModFiles(self, modId: int, gameVersion: int|None = None, modLoaderType: schemas.ModLoaderType|None = None, gameVersionTypeId: int|None = None, index: int|None = None, pageSize: int|None = None) -> schemas.GetModFilesResponse|schemas.ApiResponseCode:
-        # region init
-        # region bounds checking
-        if index is not None:
-            if not 0 <= index <= 10000:
-                return schemas.ApiResponseCode.BadRequest
-        if pageSize is not None:
-            if not 0 <= pageSize <= 50:
-                return schemas.ApiResponseCode.BadRequest
-        if index is not None and pageSize is not None:
-            if not index + pageSize <= 10000:
-                return schemas.ApiResponseCode.BadRequest
-        # endregion
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/mods/{modId}/files{self.__query_builder(this, *lvars)}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
+        return self.__call(ENDPOINTS["getModFiles"], modId=modId, gameVersion=gameVersion, modLoaderType=modLoaderType, gameVersionTypeId=gameVersionTypeId, index=index, pageSize=pageSize)
 
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetModFilesResponse(**response.json())
-        else:
-            return status
+    def __post_files(self, fileIds: list[int]) -> schemas.GetFilesResponse|schemas.ApiResponseCode:
+        return self.__call(ENDPOINTS["getFiles"], body=schemas.GetModFilesRequestBody(fileIds))
 
-    def getFiles(self, body: schemas.GetModFilesRequestBody) -> schemas.GetFilesResponse|schemas.ApiResponseCode:
-        # region init
-        # endregion
-        response = self.csesh.post(self.base_url+'/v1/mods/files', headers=self.headers, data=str(body))
-        
-        status = schemas.ApiResponseCode(response.status_code)
+    def getFiles(self, body: schemas.GetModFilesRequestBody|list[int], chunkSize: int = ID_CHUNK_SIZE, maxWorkers: int = DEFAULT_MAX_WORKERS) -> schemas.GetFilesResponse|schemas.ApiResponseCode:
+        """
+        get a list of files from their ids
 
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetFilesResponse(**response.json())
-        else:
-            return status
+        body: any number of file ids, duplicates are only requested once
 
-    def getModFileChangelog(self, modId: int, fileId: int) -> schemas.StringResponse|schemas.ApiResponseCode:
-        # region init
-        url = self.base_url + f"/v1/mods/{modId}/files/{fileId}/changelog"
-        # endregion
+        chunkSize: the maximum number of ids sent in a single request
 
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
+        maxWorkers: how many chunk requests may be in flight at once
 
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.StringResponse(**response.json())
-        else:
-            return status
+        returns GetFilesResponse with the files in the order of the file ids, or the status of the first failed chunk
+        """
+        fileIds = body.fileIds if isinstance(body, schemas.GetModFilesRequestBody) else body
+        chunks = _chunk_ids(fileIds, chunkSize)
+        merged = _merge_chunks(chunks, self.__fan_out(self.__post_files, chunks, maxWorkers))
+        return merged if isinstance(merged, schemas.ApiResponseCode) else self.schemaClasses.GetFilesResponse(merged)
+
+    def getModFileChangelog(self, modId: int, fileId: int) -> schemas.StringResponse|schemas.ApiResponseCode:
+        return self.__call(ENDPOINTS["getModFileChangelog"], modId=modId, fileId=fileId)
 
     def getModFileDownloadUrl(self, modId: int, fileId: int) -> schemas.StringResponse|schemas.ApiResponseCode:
-        # region init
-        url = self.base_url + f"/v1/mods/{modId}/files/{fileId}/download-url"
-        # endregion
+        return self.__call(ENDPOINTS["getModFileDownloadUrl"], modId=modId, fileId=fileId)
 
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
+    def __post_fingerprints(self, fingerprints: list[int]) -> schemas.GetFingerprintMatchesResponse|schemas.ApiResponseCode:
+        return self.__call(ENDPOINTS["getFingerprintsMatches"], body=schemas.GetFingerprintMatchesRequestBody(fingerprints))
 
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.StringResponse(**response.json())
-        else:
-            return status
+    def getFingerprintsMatches(self, body: schemas.GetFingerprintMatchesRequestBody|list[int], chunkSize: int = ID_CHUNK_SIZE, maxWorkers: int = DEFAULT_MAX_WORKERS) -> schemas.GetFingerprintMatchesResponse|schemas.ApiResponseCode:
+        """
+        get the files matching a list of fingerprints
 
-    def getFingerprintsMatches(self, body: schemas.GetFingerprintMatchesRequestBody) -> schemas.GetFingerprintMatchesResponse|schemas.ApiResponseCode:
-        # region init
-        # endregion
-        response = self.csesh.post(self.base_url+'/v1/fingerprints/', headers=self.headers, data=str(body))
-        
-        status = schemas.ApiResponseCode(response.status_code)
+        body: any number of fingerprints, duplicates are only requested once
 
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetFingerprintMatchesResponse(**response.json())
-        else:
-            return status
+        chunkSize: the maximum number of fingerprints sent in a single request
 
-    def getFingerprintsFuzzyMatches(self, body: schemas.GetFuzzyMatchesRequestBody) -> schemas.GetFingerprintsFuzzyMatchesResponse|schemas.ApiResponseCode:
-        # region init
-        # endregion
-        response = self.csesh.post(self.base_url+'/v1/fingerprints/fuzzy', headers=self.headers, data=str(body))
-        
-        status = schemas.ApiResponseCode(response.status_code)
+        maxWorkers: how many chunk requests may be in flight at once
 
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetFingerprintsFuzzyMatchesResponse(**response.json())
-        else:
-            return status
+        returns GetFingerprintMatchesResponse with the results of every chunk merged, or the status of the first failed chunk
+        """
+        fingerprints = body.fingerprints if isinstance(body, schemas.GetFingerprintMatchesRequestBody) else body
+        chunks = _chunk_ids(fingerprints, chunkSize)
+        merged = _merge_fingerprint_chunks(self.__fan_out(self.__post_fingerprints, chunks, maxWorkers), self.schemaClasses)
+        return merged if isinstance(merged, schemas.ApiResponseCode) else self.schemaClasses.GetFingerprintMatchesResponse(merged)
 
-    def getMinecraftVersions(self, sortDescending: bool|None = None) -> schemas.ApiResponseOfListOfMinecraftGameVersion|schemas.ApiResponseCode:
-        # region init
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/minecraft/version{self.__query_builder(this, *lvars)}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
+    def getFingerprintsFuzzyMatches(self, body: schemas.GetFuzzyMatchesRequestBody) -> schemas.GetFingerprintsFuzzyMatchesResponse|schemas.ApiResponseCode:
+        return self.__call(ENDPOINTS["getFingerprintsFuzzyMatches"], body=body)
 
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.ApiResponseOfListOfMinecraftGameVersion(**response.json())
-        else:
-            return status
+    def getMinecraftVersions(self, sortDescending: bool|None = None) -> schemas.ApiResponseOfListOfMinecraftGameVersion|schemas.ApiResponseCode:
+        return self.__call(ENDPOINTS["getMinecraftVersions"], sortDescending=sortDescending)
     
     def getSpecificMinecraftVersion(self, version: str) -> schemas.ApiResponseOfMinecraftGameVersion|schemas.ApiResponseCode:
-        # region init
-        url = self.base_url + f"/v1/minecraft/version/{version}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.ApiResponseOfMinecraftGameVersion(**response.json())
-        else:
-            return status
+        return self.__call(ENDPOINTS["getSpecificMinecraftVersion"], version=version)
 
     def getMinecraftModloaders(self, version: str|None = None, includeAll: bool|None = None) -> schemas.ApiResponseOfListOfMinecraftModLoaderIndex | schemas.ApiResponseCode:
-        # region init
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/minecraft/modloader{self.__query_builder(this, *lvars)}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.ApiResponseOfListOfMinecraftModLoaderIndex(**response.json())
-        else:
-            return status
+        return self.__call(ENDPOINTS["getMinecraftModloaders"], version=version, includeAll=includeAll)
     
     def getSpecificMinecraftModloader(self, modLoaderName: str) -> schemas.ApiResponseOfMinecraftModLoaderVersion|schemas.ApiResponseCode:
-        # region init
-        url = self.base_url + f"/v1/minecraft/modloader/{modLoaderName}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.headers)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.ApiResponseOfMinecraftModLoaderVersion(**response.json())
-        else:
-            return status
\ No newline at end of file
+        return self.__call(ENDPOINTS["getSpecificMinecraftModloader"], modLoaderName=modLoaderName)
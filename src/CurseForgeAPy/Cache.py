@@ -0,0 +1,133 @@
+from CurseForgeAPy.Endpoints import ENDPOINTS, Endpoint
+from contextlib import closing
+import requests_cache as rqc
+import sqlite3
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+# the expire_after values understood by both cache libraries
+NEVER_EXPIRE = -1
+DO_NOT_CACHE = 0
+
+# how long each endpoint's responses are cached, by how often the data behind them changes
+DEFAULT_TTLS: dict[str, int] = {
+    "getGames": DAY,
+    "getGame": DAY,
+    "getVersions": DAY,
+    "getVersionTypes": DAY,
+    "getCategories": DAY,
+    "searchMods": MINUTE,
+    "getMod": 5 * MINUTE,
+    "getMods": 5 * MINUTE,
+    "getFeatured_mods": 5 * MINUTE,
+    "getModDescription": HOUR,
+    "getModFile": HOUR,
+    "getModFiles": 5 * MINUTE,
+    "getFiles": HOUR,
+    "getModFileChangelog": DAY,
+    "getModFileDownloadUrl": DAY,
+    "getFingerprintsMatches": 5 * MINUTE,
+    "getFingerprintsFuzzyMatches": 5 * MINUTE,
+    "getMinecraftVersions": DAY,
+    "getSpecificMinecraftVersion": DAY,
+    "getMinecraftModloaders": HOUR,
+    "getSpecificMinecraftModloader": DAY,
+}
+
+BACKENDS = ("memory", "sqlite", "filesystem", "redis")
+
+def _specificity(endpoint: Endpoint) -> tuple[int, int]:
+    segments = endpoint.path.strip("/").split("/")
+    return len(segments), sum(not segment.startswith("{") for segment in segments)
+
+class CachePolicy(object):
+    """
+    How long each endpoint's responses are cached, and where
+
+    The TTLs become the urls_expire_after patterns of the HTTP cache, built from the endpoint registry so they
+    cannot drift from the paths the clients request. TTLs are seconds, NEVER_EXPIRE (-1) or DO_NOT_CACHE (0).
+
+    ttls: TTLs by client method name (getMod, searchMods, getMinecraftVersions, ...), merged over DEFAULT_TTLS
+
+    default: the TTL of anything no endpoint TTL matches
+
+    backend: "memory", "sqlite" (in WAL mode, so readers never wait on the writer), "filesystem" or "redis",
+    or a ready made requests_cache / aiohttp_client_cache backend object
+
+    name: the sqlite file, cache directory or redis namespace, defaults to the name the client has always used
+
+    connection: the redis client to use instead of connecting to localhost, any Redis-protocol compatible object works,
+    e.g. a fakeredis.FakeRedis in tests (a redis.asyncio client for the async session)
+
+    cachePost: also cache the POST endpoints, which are all lookups (getMods, getFiles, fingerprints, ...)
+    """
+    def __init__(self, ttls: dict[str, int]|None = None, default: int = 5 * MINUTE, backend = "sqlite", name: str|None = None, connection = None, cachePost: bool = False) -> None:
+        if isinstance(backend, str) and backend not in BACKENDS:
+            raise ValueError(f"Unknown cache backend {backend!r}, expected one of: {', '.join(BACKENDS)}")
+        unknown = set(ttls or ()) - ENDPOINTS.keys()
+        if unknown:
+            raise ValueError(f"No such endpoint: {', '.join(sorted(unknown))}")
+        self.ttls: dict[str, int] = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default: int = default
+        self.backend = backend
+        self.name: str|None = name
+        self.connection = connection
+        self.cachePost: bool = cachePost
+
+    def urlsExpireAfter(self) -> dict[str, int]:
+        """
+        glob patterns of every endpoint with its TTL, the most specific first as both libraries use the first match
+
+        Patterns match any host, so the policy still applies when base_url is changed.
+        """
+        patterns = {}
+        for endpoint in sorted(ENDPOINTS.values(), key=_specificity, reverse=True):
+            if endpoint.name in self.ttls:
+                pattern = "*" + endpoint.path
+                for param in endpoint.pathParams:
+                    pattern = pattern.replace("{" + param + "}", "*")
+                patterns.setdefault(pattern, self.ttls[endpoint.name])
+        return patterns
+
+    @property
+    def methods(self) -> tuple[str, ...]:
+        return ("GET", "HEAD", "POST") if self.cachePost else ("GET", "HEAD")
+
+    def session(self) -> rqc.CachedSession:
+        """ a requests_cache session applying the policy, as used by CurseForgeAPI """
+        name = self.name or "CurseForgeAPY-Cache"
+        if self.backend == "sqlite":
+            backend = rqc.SQLiteCache(name, wal=True)
+        elif self.backend == "filesystem":
+            backend = rqc.FileCache(name)
+        elif self.backend == "redis":
+            backend = rqc.RedisCache(name, connection=self.connection)
+        else:
+            backend = self.backend
+        return rqc.CachedSession(backend=backend, expire_after=self.default, urls_expire_after=self.urlsExpireAfter(), allowable_methods=self.methods)
+
+    def asyncBackend(self):
+        """ an aiohttp_client_cache backend applying the policy, as used by AsyncCurseForgeAPI """
+        from aiohttp_client_cache import CacheBackend, SQLiteBackend
+        name = self.name or "CurseForgeAPY-AsyncCache"
+        settings = {"expire_after": self.default, "urls_expire_after": self.urlsExpireAfter(), "allowed_methods": self.methods}
+        if self.backend == "memory":
+            return CacheBackend(name, **settings)
+        if self.backend == "sqlite":
+            backend = SQLiteBackend(name, **settings)
+            # aiohttp_client_cache has no WAL option, but journal_mode=WAL is persistent so it can be set up front
+            with closing(sqlite3.connect(backend.responses.filename)) as db:
+                db.execute("PRAGMA journal_mode=WAL")
+            return backend
+        if self.backend == "filesystem":
+            from aiohttp_client_cache import FileBackend
+            return FileBackend(name, **settings)
+        if self.backend == "redis":
+            from aiohttp_client_cache import RedisBackend
+            return RedisBackend(name, connection=self.connection, **settings)
+        return self.backend
+
+    def ttl(self, name: str) -> int:
+        """ the TTL of the endpoint behind the client method name """
+        return self.ttls.get(name, self.default)
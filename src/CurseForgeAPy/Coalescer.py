@@ -0,0 +1,69 @@
+from concurrent.futures import Future
+import threading
+
+class RequestCoalescer(object):
+    """
+    Collects single key lookups made from any number of threads within a short window and resolves them with one batch call
+
+    batch: called with a list of unique keys, must return a dict of key -> result, keys missing from the dict resolve to missing
+
+    window: how long in seconds to wait for more keys after the first one of a batch arrives
+
+    maxBatchSize: a batch is sent straight away once it holds this many keys
+
+    missing: the result given to keys the batch call did not return
+    """
+    def __init__(self, batch, window: float = 0.01, maxBatchSize: int = 500, missing=None) -> None:
+        self.batch = batch
+        self.window: float = window
+        self.maxBatchSize: int = maxBatchSize
+        self.missing = missing
+        self.__lock = threading.Lock()
+        self.__pending: dict = {}
+        self.__timer: threading.Timer|None = None
+
+    def load(self, key):
+        """ blocks until the batch containing key has been resolved and returns its result """
+        return self.submit(key).result()
+
+    def submit(self, key) -> Future:
+        """ queues key for the next batch and returns a Future of its result, keys already queued share one Future """
+        batch = None
+        with self.__lock:
+            future = self.__pending.get(key)
+            if future is None:
+                future = self.__pending[key] = Future()
+                if len(self.__pending) >= self.maxBatchSize:
+                    batch = self.__take()
+                elif self.__timer is None:
+                    self.__timer = threading.Timer(self.window, self.flush)
+                    self.__timer.daemon = True
+                    self.__timer.start()
+        if batch:
+            self.__resolve(batch)
+        return future
+
+    def flush(self) -> None:
+        """ sends the pending batch now instead of waiting for the window to end """
+        with self.__lock:
+            batch = self.__take()
+        if batch:
+            self.__resolve(batch)
+
+    def __take(self) -> dict:
+        """ detaches the pending batch, the lock must be held """
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        batch, self.__pending = self.__pending, {}
+        return batch
+
+    def __resolve(self, batch: dict) -> None:
+        try:
+            results = self.batch(list(batch))
+        except BaseException as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+        for key, future in batch.items():
+            future.set_result(results.get(key, self.missing))
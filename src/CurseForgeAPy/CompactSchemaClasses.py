@@ -0,0 +1,52 @@
+"""
+__slots__ based versions of every class in SchemaClasses
+
+Each class here has the same name, constructor and attributes as its SchemaClasses counterpart, but stores its
+fields in slots instead of a per-instance __dict__, cutting around a quarter of the memory of large resident
+collections of Mod and File objects (see benchmarks/bench_memory.py). Nested objects are built from the compact classes too, and enums are shared with SchemaClasses.
+
+Compact objects are always fully hydrated, lazy hydration needs an instance __dict__ and is ignored here.
+They are not instances of the SchemaClasses types, so isinstance checks against those will not match.
+
+    import CurseForgeAPy.CompactSchemaClasses as compact
+    mod = compact.Mod(**modJson)
+"""
+import enum
+import types
+import CurseForgeAPy.SchemaClasses as schemas
+
+# the globals the compact constructors run with, so that nested classes resolve to their compact versions
+_namespace: dict = dict(vars(schemas))
+
+class CompactBase(schemas.Base):
+    __slots__ = ()
+    # the SchemaClasses class this one was built from
+    _schema: type = schemas.Base
+
+    def _set_fields(self, **values) -> None:
+        """ always converts eagerly, using the converters of the SchemaClasses LazyFields """
+        schema = self._schema
+        for name, value in values.items():
+            setattr(self, name, schema.__dict__[name].convert(value, _namespace))
+
+def _compact(cls: type) -> type:
+    """ builds the slotted version of a SchemaClasses class, reusing its constructor with the compact namespace """
+    init = cls.__init__
+    code = init.__code__
+    fields = code.co_varnames[1:code.co_argcount]
+    compactInit = types.FunctionType(code, _namespace, init.__name__, init.__defaults__, init.__closure__)
+    compactInit.__kwdefaults__ = init.__kwdefaults__
+    return type(cls.__name__, (CompactBase,), {
+        "__slots__": fields,
+        "__init__": compactInit,
+        "__module__": __name__,
+        "__qualname__": cls.__qualname__,
+        "__doc__": cls.__doc__,
+        "_schema": cls,
+    })
+
+for _name, _cls in vars(schemas).copy().items():
+    if isinstance(_cls, type) and issubclass(_cls, schemas.Base) and _cls is not schemas.Base and not issubclass(_cls, enum.Enum):
+        _namespace[_name] = globals()[_name] = _compact(_cls)
+
+del _name, _cls
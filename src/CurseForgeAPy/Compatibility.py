@@ -0,0 +1,129 @@
+from CurseForgeAPy.SchemaClasses import FileIndex, FileReleaseType, Mod, ModLoaderType
+from bisect import insort
+import re
+import threading
+
+ANY_RELEASE_TYPE = (FileReleaseType.Release, FileReleaseType.Beta, FileReleaseType.Alpha)
+# loaders a file index lists when the file does not depend on any particular loader
+AGNOSTIC_LOADERS = (ModLoaderType.Any, ModLoaderType.NoneFound)
+
+_NUMBER = re.compile(r"\d+")
+
+def padVersion(version: str) -> str:
+    """ a version in CurseForge's gameVersionPadded form, every number padded to 10 digits, e.g. "0000000001.0000000019.0000000002" """
+    return _NUMBER.sub(lambda match: match.group().zfill(10), version)
+
+class CompatibilityIndex(object):
+    """
+    The best file of each mod for every (gameVersion, ModLoaderType, FileReleaseType), built from Mod.latestFilesIndexes
+
+    Looking up a mod's file for a game version and loader costs a few dict lookups, without scanning its files or
+    calling getModFiles. Game versions are ordered by the gameVersionPadded of File.sortableGameVersions, shared by
+    every mod in the index, falling back to padVersion for versions no file has described.
+    Thread safe, and it can observe a client like SearchIndex.
+
+        index = CompatibilityIndex()
+        index.addMany(cf.getMods(modIds).data)
+        files = index.bestFiles(modIds, "1.19.2", ModLoaderType.Forge)
+    """
+    def __init__(self) -> None:
+        # keyed by (gameVersion, loader, releaseType), and by (gameVersion, None, releaseType) for the newest of any loader
+        self.__files: dict[int, dict[tuple[str, ModLoaderType|None, FileReleaseType], FileIndex]] = {}
+        # the game versions of each mod, lowest first by their padded form
+        self.__versions: dict[int, list[tuple[str, str]]] = {}
+        self.__padded: dict[str, str] = {}
+        self.__lock = threading.Lock()
+
+    def add(self, mod: Mod) -> None:
+        self.addMany([mod])
+
+    def addMany(self, mods) -> None:
+        """ indexes the latestFilesIndexes of mods, replacing what was indexed for them before """
+        with self.__lock:
+            for mod in mods:
+                for file in mod.latestFiles:
+                    for version in file.sortableGameVersions:
+                        if version.gameVersionPadded:
+                            self.__padded[version.gameVersionName] = version.gameVersionPadded
+                files = {}
+                for index in mod.latestFilesIndexes:
+                    for key in ((index.gameVersion, index.modLoader, index.releaseType), (index.gameVersion, None, index.releaseType)):
+                        # the newest file wins, file ids only grow
+                        if key not in files or index.fileId > files[key].fileId:
+                            files[key] = index
+                self.__files[mod.id] = files
+                versions = []
+                for version in dict.fromkeys(key[0] for key in files):
+                    insort(versions, (self.padded(version), version))
+                self.__versions[mod.id] = versions
+
+    def remove(self, modId: int) -> None:
+        with self.__lock:
+            self.__files.pop(modId, None)
+            self.__versions.pop(modId, None)
+
+    def observe(self, response) -> None:
+        """ response hook indexing the mods of any GetModResponse, GetModsResponse, SearchModsResponse or GetFeaturedModsResponse """
+        data = getattr(response, "data", None)
+        if isinstance(data, list):
+            self.addMany(mod for mod in data if hasattr(mod, "latestFilesIndexes"))
+        elif hasattr(data, "latestFilesIndexes"):
+            self.add(data)
+        elif hasattr(data, "featured"):
+            self.addMany([*data.featured, *data.popular, *data.recentlyUpdated])
+
+    def attach(self, client) -> None:
+        """ indexes every mod client fetches from now on, works with CurseForgeAPI and AsyncCurseForgeAPI """
+        client.responseHooks.append(self.observe)
+
+    def padded(self, version: str) -> str:
+        """ the gameVersionPadded of version, for ordering game versions """
+        padded = self.__padded.get(version)
+        return padded if padded is not None else padVersion(version)
+
+    def bestFile(self, modId: int, gameVersion: str, modLoaderType: ModLoaderType|None = None, releaseTypes: tuple[FileReleaseType, ...] = ANY_RELEASE_TYPE) -> FileIndex|None:
+        """
+        the file to install of modId for gameVersion and modLoaderType, None when it has none or modId is not indexed
+
+        A file for exactly modLoaderType beats a loader agnostic one, then the earlier of releaseTypes wins.
+        modLoaderType None accepts any loader, the newest file of the most preferred release type wins.
+        """
+        files = self.__files.get(modId)
+        if not files:
+            return None
+        for loader in ((None,) if modLoaderType is None else (modLoaderType, *AGNOSTIC_LOADERS)):
+            for releaseType in releaseTypes:
+                index = files.get((gameVersion, loader, releaseType))
+                if index is not None:
+                    return index
+        return None
+
+    def bestFiles(self, modIds: list[int], gameVersion: str, modLoaderType: ModLoaderType|None = None, releaseTypes: tuple[FileReleaseType, ...] = ANY_RELEASE_TYPE) -> dict[int, FileIndex]:
+        """ bestFile of every mod of modIds that has one, keyed by mod id """
+        found = {}
+        for modId in modIds:
+            index = self.bestFile(modId, gameVersion, modLoaderType, releaseTypes)
+            if index is not None:
+                found[modId] = index
+        return found
+
+    def gameVersions(self, modId: int) -> list[str]:
+        """ the game versions modId has files for, newest first """
+        return [version for _, version in reversed(self.__versions.get(modId, ()))]
+
+    def latestFile(self, modId: int, modLoaderType: ModLoaderType|None = None, releaseTypes: tuple[FileReleaseType, ...] = ANY_RELEASE_TYPE, maxGameVersion: str|None = None) -> FileIndex|None:
+        """ bestFile for the newest game version modId supports, up to maxGameVersion when given """
+        limit = self.padded(maxGameVersion) if maxGameVersion is not None else None
+        for padded, version in reversed(self.__versions.get(modId, ())):
+            if limit is not None and padded > limit:
+                continue
+            index = self.bestFile(modId, version, modLoaderType, releaseTypes)
+            if index is not None:
+                return index
+        return None
+
+    def __len__(self) -> int:
+        return len(self.__files)
+
+    def __contains__(self, modId: int) -> bool:
+        return modId in self.__files
@@ -0,0 +1,194 @@
+from CurseForgeAPy.CFAPI import CurseForgeAPI
+from CurseForgeAPy.SchemaClasses import ApiResponseCode, File, FileHash
+from CurseForgeAPy.Utils import DOWNLOAD_CHUNK_SIZE, HashMismatchError, downloadFileFromURL, preferredHash
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+import os
+import threading
+import time
+
+class DownloadResult(object):
+    """
+    The outcome of downloading one file
+
+    file: the File that was downloaded, None when its (modId, fileId) could not be resolved
+
+    path: where the file was written
+
+    status: ApiResponseCode.OK on success, the failed status otherwise, None when the download raised
+
+    error: the exception the download raised, a HashMismatchError when every attempt failed verification
+
+    verifiedHash: the hash of File.hashes the written file was checked against, None when the file has none or verify was off
+    """
+    def __init__(self, file: File|None, path: str|None, status: ApiResponseCode|None, bytes: int = 0, seconds: float = 0.0, error: BaseException|None = None, verifiedHash: FileHash|None = None) -> None:
+        self.file: File|None = file
+        self.path: str|None = path
+        self.status: ApiResponseCode|None = status
+        self.bytes: int = bytes
+        self.seconds: float = seconds
+        self.error: BaseException|None = error
+        self.verifiedHash: FileHash|None = verifiedHash
+
+    @property
+    def ok(self) -> bool:
+        return self.status == ApiResponseCode.OK
+
+    def __repr__(self) -> str:
+        name = self.file.fileName if self.file is not None else None
+        return f"DownloadResult({name!r}, {self.status}, {self.bytes} bytes)"
+
+class DownloadProgress(object):
+    """ aggregate progress of a bulk download, passed to the onProgress callback """
+    def __init__(self, totalFiles: int, totalBytes: int) -> None:
+        self.totalFiles: int = totalFiles
+        self.totalBytes: int = totalBytes
+        self.completedFiles: int = 0
+        self.failedFiles: int = 0
+        self.bytesDone: int = 0
+        self.started: float = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def bytesPerSecond(self) -> float:
+        elapsed = self.elapsed
+        return self.bytesDone / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return f"DownloadProgress({self.completedFiles + self.failedFiles}/{self.totalFiles} files, {self.bytesDone}/{self.totalBytes} bytes, {self.bytesPerSecond / 1024 / 1024:.1f} MiB/s)"
+
+class BulkDownloader(object):
+    """
+    Downloads many files concurrently, with at most maxWorkers downloads in flight and at most maxPerHost to any one host
+
+    Every download goes through Utils.downloadFileFromURL, so it is streamed, written atomically and resumable.
+
+    onProgress: called with the DownloadProgress after every chunk written
+
+    onFileComplete: called with the DownloadResult of each file as it finishes
+
+    verify: check every file against File.hashes while it is written
+
+    hashRetries: how many more times a file failing verification is downloaded before its result reports the HashMismatchError
+
+    Callbacks run on the worker threads, so they should be quick and thread safe.
+
+        downloader = BulkDownloader(cf, maxWorkers=16, onFileComplete=print)
+        results = downloader.download([(238222, 4371807), (306612, 4371809)], "mods")
+    """
+    def __init__(self, client: CurseForgeAPI, maxWorkers: int = 16, maxPerHost: int = 8, chunkSize: int = DOWNLOAD_CHUNK_SIZE, onProgress=None, onFileComplete=None, verify: bool = True, hashRetries: int = 1) -> None:
+        if maxWorkers < 1 or maxPerHost < 1:
+            raise ValueError("maxWorkers and maxPerHost must be at least 1")
+        self.client: CurseForgeAPI = client
+        self.maxWorkers: int = maxWorkers
+        self.maxPerHost: int = maxPerHost
+        self.chunkSize: int = chunkSize
+        self.onProgress = onProgress
+        self.onFileComplete = onFileComplete
+        self.verify: bool = verify
+        self.hashRetries: int = hashRetries
+        self.__hosts: dict[str, threading.Semaphore] = {}
+        self.__lock = threading.Lock()
+        # keep a pooled connection for every worker instead of requests' default of 10 per host
+        adapter = HTTPAdapter(pool_connections=maxWorkers, pool_maxsize=maxWorkers)
+        client.downloadSession.mount("https://", adapter)
+        client.downloadSession.mount("http://", adapter)
+
+    def resolve(self, files: list[File|tuple[int, int]]) -> list[File|ApiResponseCode]:
+        """
+        turns (modId, fileId) pairs into File objects with a single batched getFiles call
+
+        pairs are tuples or lists, anything else is taken to be a File, from SchemaClasses or CompactSchemaClasses.
+        Pairs that do not resolve become ApiResponseCode.NotFound, or the status of the getFiles call if it failed
+        """
+        pairs = [item for item in files if isinstance(item, (tuple, list))]
+        found = {}
+        if pairs:
+            response = self.client.getFiles([fileId for _, fileId in pairs])
+            if isinstance(response, ApiResponseCode):
+                return [response if isinstance(item, (tuple, list)) else item for item in files]
+            found = {(file.modId, file.id): file for file in response.data}
+        return [found.get((int(item[0]), int(item[1])), ApiResponseCode.NotFound) if isinstance(item, (tuple, list)) else item for item in files]
+
+    def download(self, files: list[File|tuple[int, int]], directory: str) -> list[DownloadResult]:
+        """
+        downloads every file into directory under its fileName
+
+        files: File objects, (modId, fileId) pairs or a mix of both
+
+        returns a DownloadResult per file, in the order of files. A file with the same fileName as an earlier one
+        would be written to the same path at the same time, its result is ApiResponseCode.Conflict instead
+        """
+        os.makedirs(directory, exist_ok=True)
+        resolved = self.resolve(files)
+        paths = []
+        claimed = set()
+        for file in resolved:
+            path = None if isinstance(file, ApiResponseCode) else os.path.join(directory, os.path.basename(file.fileName))
+            key = os.path.normcase(path) if path is not None else None
+            paths.append((path, key in claimed))
+            claimed.add(key)
+        progress = DownloadProgress(len(resolved), sum(file.fileLength or 0 for file, (_, conflict) in zip(resolved, paths) if not isinstance(file, ApiResponseCode) and not conflict))
+        with ThreadPoolExecutor(max_workers=self.maxWorkers) as pool:
+            return list(pool.map(lambda file, path: self.__download(file, *path, progress), resolved, paths))
+
+    def __host(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).netloc
+        with self.__lock:
+            if host not in self.__hosts:
+                self.__hosts[host] = threading.Semaphore(self.maxPerHost)
+            return self.__hosts[host]
+
+    def __download(self, file: File|ApiResponseCode, path: str|None, conflict: bool, progress: DownloadProgress) -> DownloadResult:
+        if isinstance(file, ApiResponseCode):
+            result = DownloadResult(None, None, file)
+        elif conflict:
+            # another file of the batch is being written to path
+            result = DownloadResult(file, path, ApiResponseCode.Conflict)
+        elif not file.downloadUrl:
+            # the author has disabled third party downloads of this mod
+            result = DownloadResult(file, None, ApiResponseCode.Forbidden)
+        else:
+            result = self.__fetch(file, path, progress)
+        with self.__lock:
+            if result.ok:
+                progress.completedFiles += 1
+            else:
+                progress.failedFiles += 1
+        if self.onFileComplete is not None:
+            self.onFileComplete(result)
+        return result
+
+    def __fetch(self, file: File, path: str, progress: DownloadProgress) -> DownloadResult:
+        written = 0
+        def onChunk(size: int) -> None:
+            nonlocal written
+            written += size
+            with self.__lock:
+                progress.bytesDone += size
+            if self.onProgress is not None:
+                self.onProgress(progress)
+
+        hashes = file.hashes if self.verify else None
+        started = time.monotonic()
+        with self.__host(file.downloadUrl):
+            for attempt in range(self.hashRetries + 1):
+                try:
+                    status = downloadFileFromURL(self.client, file.downloadUrl, path, self.chunkSize, onChunk=onChunk, hashes=hashes)
+                except HashMismatchError as e:
+                    # the discarded bytes no longer count towards the progress
+                    with self.__lock:
+                        progress.bytesDone -= written
+                    written = 0
+                    if attempt == self.hashRetries:
+                        return DownloadResult(file, path, None, 0, time.monotonic() - started, e)
+                except Exception as e:
+                    return DownloadResult(file, path, None, written, time.monotonic() - started, e)
+                else:
+                    break
+        verified = preferredHash(hashes) if status == ApiResponseCode.OK else None
+        return DownloadResult(file, path, status, written, time.monotonic() - started, verifiedHash=verified)
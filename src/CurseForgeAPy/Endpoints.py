@@ -0,0 +1,92 @@
+from requests.utils import quote
+import CurseForgeAPy.SchemaClasses as schemas
+import enum
+import string
+
+# CurseForge rejects any paginated request where index + pageSize > 10000
+PAGINATION_LIMIT = 10000
+MAX_PAGE_SIZE = 50
+
+class Endpoint(object):
+    """
+    A single CurseForge API endpoint, everything needed to build its requests is worked out once at import
+
+    name: the client method the endpoint belongs to
+
+    method: the HTTP method
+
+    path: a str.format template of the path, e.g. "/v1/mods/{modId}/files"
+
+    responseClass: the SchemaClasses class successful responses are built into
+
+    query: the names of the optional query parameters, in the order they are sent
+
+    paginated: whether index and pageSize are bounds checked before sending
+    """
+    def __init__(self, name: str, method: str, path: str, responseClass: type, query: tuple[str, ...] = (), paginated: bool = False) -> None:
+        self.name: str = name
+        self.method: str = method
+        self.path: str = path
+        self.responseClass: type = responseClass
+        self.query: tuple[str, ...] = query
+        self.paginated: bool = paginated
+        self.pathParams: tuple[str, ...] = tuple(field for _, field, _, _ in string.Formatter().parse(path) if field)
+
+    def inBounds(self, index: int|None, pageSize: int|None) -> bool:
+        """ whether index and pageSize are within what the API accepts, always True for endpoints that are not paginated """
+        if not self.paginated:
+            return True
+        if index is not None and not 0 <= index <= PAGINATION_LIMIT:
+            return False
+        if pageSize is not None and not 0 <= pageSize <= MAX_PAGE_SIZE:
+            return False
+        if index is not None and pageSize is not None and not index + pageSize <= PAGINATION_LIMIT:
+            return False
+        return True
+
+    def url(self, base_url: str, **params) -> str:
+        """ fills in the path and appends every query parameter that is not None """
+        path = self.path.format(**params) if self.pathParams else self.path
+        pairs = []
+        for name in self.query:
+            value = params.get(name)
+            if value is not None:
+                pairs.append(quote(f"{name}={_query_value(value)}", safe="="))
+        return base_url + path + ("?" + "&".join(pairs) if pairs else "")
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.name!r}, {self.method} {self.path})"
+
+def _query_value(value) -> str:
+    if isinstance(value, enum.Enum):
+        value = value.value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+_SEARCH = ("gameId", "classId", "categoryId", "gameVersion", "searchFilter", "sortField", "sortOrder", "modLoaderType", "gameVersionTypeId", "slug", "index", "pageSize")
+
+# every endpoint the clients call, keyed by the name of the client method
+ENDPOINTS: dict[str, Endpoint] = {endpoint.name: endpoint for endpoint in (
+    Endpoint("getGames", "GET", "/v1/games", schemas.GetGamesResponse, ("index", "pageSize"), paginated=True),
+    Endpoint("getGame", "GET", "/v1/games/{gameId}", schemas.GetGameResponse),
+    Endpoint("getVersions", "GET", "/v1/games/{gameId}/versions", schemas.GetVersionsResponse),
+    Endpoint("getVersionTypes", "GET", "/v1/games/{gameId}/version-types", schemas.GetVersionTypesResponse),
+    Endpoint("getCategories", "GET", "/v1/categories", schemas.GetCategoriesResponse, ("gameId", "classId", "classesOnly")),
+    Endpoint("searchMods", "GET", "/v1/mods/search", schemas.SearchModsResponse, _SEARCH, paginated=True),
+    Endpoint("getMod", "GET", "/v1/mods/{modId}", schemas.GetModResponse),
+    Endpoint("getMods", "POST", "/v1/mods", schemas.GetModsResponse),
+    Endpoint("getFeatured_mods", "POST", "/v1/mods/featured", schemas.GetFeaturedModsResponse),
+    Endpoint("getModDescription", "GET", "/v1/mods/{modId}/description", schemas.StringResponse),
+    Endpoint("getModFile", "GET", "/v1/mods/{modId}/files/{fileId}", schemas.GetModFileResponse),
+    Endpoint("getModFiles", "GET", "/v1/mods/{modId}/files", schemas.GetModFilesResponse, ("gameVersion", "modLoaderType", "gameVersionTypeId", "index", "pageSize"), paginated=True),
+    Endpoint("getFiles", "POST", "/v1/mods/files", schemas.GetFilesResponse),
+    Endpoint("getModFileChangelog", "GET", "/v1/mods/{modId}/files/{fileId}/changelog", schemas.StringResponse),
+    Endpoint("getModFileDownloadUrl", "GET", "/v1/mods/{modId}/files/{fileId}/download-url", schemas.StringResponse),
+    Endpoint("getFingerprintsMatches", "POST", "/v1/fingerprints", schemas.GetFingerprintMatchesResponse),
+    Endpoint("getFingerprintsFuzzyMatches", "POST", "/v1/fingerprints/fuzzy", schemas.GetFingerprintsFuzzyMatchesResponse),
+    Endpoint("getMinecraftVersions", "GET", "/v1/minecraft/version", schemas.ApiResponseOfListOfMinecraftGameVersion, ("sortDescending",)),
+    Endpoint("getSpecificMinecraftVersion", "GET", "/v1/minecraft/version/{version}", schemas.ApiResponseOfMinecraftGameVersion),
+    Endpoint("getMinecraftModloaders", "GET", "/v1/minecraft/modloader", schemas.ApiResponseOfListOfMinecraftModLoaderIndex, ("version", "includeAll")),
+    Endpoint("getSpecificMinecraftModloader", "GET", "/v1/minecraft/modloader/{modLoaderName}", schemas.ApiResponseOfMinecraftModLoaderVersion),
+)}
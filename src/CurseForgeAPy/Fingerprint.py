@@ -0,0 +1,146 @@
+"""
+CurseForge file fingerprints, as used by getFingerprintsMatches and getFingerprintsFuzzyMatches
+
+A fingerprint is the 32 bit MurmurHash2 (seed 1) of the file with every tab, newline, carriage return and space byte removed.
+
+    import CurseForgeAPy.Fingerprint as fingerprint
+    body = fingerprint.matchesRequestBody(["mods/jei-1.19.2-11.5.0.297.jar"])
+    matches = cf.getFingerprintsMatches(body)
+
+Files are memory-mapped and processed FINGERPRINT_CHUNK_SIZE bytes at a time, whitespace is stripped with bytes.translate,
+so fingerprinting a file never copies more than a chunk of it.
+The hash itself runs in C through the murmurhash2 package, a dependency, at close to disk speed. Where it cannot be
+installed the hash falls back to pure Python over 32 bit words, at around 6 MB/s.
+"""
+from CurseForgeAPy.SchemaClasses import FolderFingerprint, GetFingerprintMatchesRequestBody, GetFuzzyMatchesRequestBody
+import mmap
+import os
+import sys
+
+try:
+    from murmurhash2 import murmurhash2 as _c_murmur2
+except ImportError:
+    _c_murmur2 = None
+
+SEED = 1
+WHITESPACE = b"\t\n\r "
+# bytes of the file normalised and hashed at once, bounding memory use for any file size
+FINGERPRINT_CHUNK_SIZE = 16 * 1024 * 1024
+
+_M = 0x5BD1E995
+_M_INVERSE = pow(_M, -1, 1 << 32)
+_MASK = 0xFFFFFFFF
+
+def normalize(data: bytes) -> bytes:
+    """ removes the bytes CurseForge ignores when fingerprinting """
+    return bytes(data).translate(None, WHITESPACE)
+
+class Murmur2(object):
+    """
+    Incremental 32 bit MurmurHash2, fed normalised data in chunks of any size
+
+    MurmurHash2 mixes the total length into its initial state, so it has to be known up front.
+    With the murmurhash2 C extension every update is one C call, continuing from the state the previous one ended in.
+    """
+    def __init__(self, length: int, seed: int = SEED) -> None:
+        self.length: int = length
+        self.__h: int = (seed ^ length) & _MASK
+        self.__pending: bytes = b""
+        self.__fed: int = 0
+
+    def update(self, data: bytes) -> None:
+        self.__fed += len(data)
+        if self.__pending:
+            data = self.__pending + data
+        whole = len(data) & ~3
+        self.__pending = data[whole:]
+        if not whole:
+            return
+        if _c_murmur2 is not None:
+            # the C hash starts from seed ^ length, so seeding it with state ^ length continues from state
+            self.__h = _unmix(_c_murmur2(bytes(memoryview(data)[:whole]), self.__h ^ (whole & _MASK)))
+            return
+        words = memoryview(data)[:whole].cast("I")
+        if sys.byteorder == "big":
+            words = memoryview(_byteswapped(words))
+        h = self.__h
+        for k in words:
+            k = (k * _M) & _MASK
+            k ^= k >> 24
+            h = ((h * _M) & _MASK) ^ ((k * _M) & _MASK)
+        self.__h = h
+
+    def digest(self) -> int:
+        if self.__fed != self.length:
+            raise ValueError(f"Murmur2 was fed {self.__fed} bytes but created for {self.length}")
+        h = self.__h
+        tail = self.__pending
+        if tail:
+            if len(tail) == 3:
+                h ^= tail[2] << 16
+            if len(tail) >= 2:
+                h ^= tail[1] << 8
+            h ^= tail[0]
+            h = (h * _M) & _MASK
+        h ^= h >> 13
+        h = (h * _M) & _MASK
+        h ^= h >> 15
+        return h
+
+def _unmix(h: int) -> int:
+    """ inverts the final mix of MurmurHash2, recovering the state the hash of whole words ended in """
+    h ^= (h >> 15) ^ (h >> 30)
+    h = (h * _M_INVERSE) & _MASK
+    h ^= (h >> 13) ^ (h >> 26)
+    return h
+
+def _byteswapped(words: memoryview):
+    import array
+    swapped = array.array("I", words)
+    swapped.byteswap()
+    return swapped
+
+def murmur2(data: bytes, seed: int = SEED) -> int:
+    """ the 32 bit MurmurHash2 of data as is, without normalising it """
+    if _c_murmur2 is not None:
+        return _c_murmur2(bytes(data), seed)
+    h = Murmur2(len(data), seed)
+    h.update(data)
+    return h.digest()
+
+def fingerprintBytes(data: bytes) -> int:
+    """ the CurseForge fingerprint of data """
+    return murmur2(normalize(data))
+
+def fingerprintFile(path: str, chunkSize: int = FINGERPRINT_CHUNK_SIZE) -> int:
+    """ the CurseForge fingerprint of the file at path """
+    size = os.path.getsize(path)
+    if size == 0:
+        return murmur2(b"")
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if size <= chunkSize:
+            # one normalised copy is cheaper than two passes when it fits
+            return murmur2(mapped[:].translate(None, WHITESPACE))
+        # the normalised length has to be known before hashing, so count it in a first pass over the mapping
+        length = sum(len(mapped[i:i + chunkSize].translate(None, WHITESPACE)) for i in range(0, size, chunkSize))
+        h = Murmur2(length)
+        for i in range(0, size, chunkSize):
+            h.update(mapped[i:i + chunkSize].translate(None, WHITESPACE))
+        return h.digest()
+
+def fingerprintFiles(paths: list[str]) -> dict[str, int]:
+    """ the fingerprint of every file in paths, keyed by path """
+    return {path: fingerprintFile(path) for path in paths}
+
+def matchesRequestBody(paths: list[str]) -> GetFingerprintMatchesRequestBody:
+    """ a getFingerprintsMatches body for the files at paths """
+    return GetFingerprintMatchesRequestBody(list(fingerprintFiles(paths).values()))
+
+def folderFingerprint(folder: str) -> FolderFingerprint:
+    """ a FolderFingerprint of every file below folder, named after the folder, for fuzzy matching """
+    paths = sorted(os.path.join(root, name) for root, _, names in os.walk(folder) for name in names)
+    return FolderFingerprint(os.path.basename(os.path.normpath(folder)), [fingerprintFile(path) for path in paths])
+
+def fuzzyMatchesRequestBody(gameId: int, folders: list[str]) -> GetFuzzyMatchesRequestBody:
+    """ a getFingerprintsFuzzyMatches body for the given folders """
+    return GetFuzzyMatchesRequestBody(gameId, [folderFingerprint(folder) for folder in folders])
@@ -0,0 +1,77 @@
+from CurseForgeAPy.SchemaClasses import Base, _encode_any
+import json
+
+class JsonBackend(object):
+    """
+    A JSON implementation used to decode responses and encode request bodies
+
+    name: the name the backend is selected by
+
+    loads: decodes bytes or str into plain python objects
+
+    dumps: encodes plain python objects into a str
+    """
+    def __init__(self, name: str, loads, dumps) -> None:
+        self.name: str = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def encode(self, body) -> str:
+        """ encodes a request body, schema objects are converted to plain data first """
+        return self.dumps(_to_plain(body))
+
+    def __repr__(self) -> str:
+        return f"JsonBackend({self.name!r})"
+
+_PRIMITIVES = frozenset((str, int, float, bool, type(None)))
+
+def _to_plain(value):
+    """ converts schema objects, enums and datetimes into JSON-compatible data """
+    if type(value) in _PRIMITIVES:
+        return value
+    if isinstance(value, Base):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        # id and fingerprint lists are the bulk of most bodies and need no conversion
+        if all(type(v) is int for v in value):
+            return value
+        return [_to_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_plain(v) for k, v in value.items()}
+    return _encode_any(value)
+
+def _stdlib() -> JsonBackend:
+    return JsonBackend("stdlib", json.loads, lambda obj: json.dumps(obj, separators=(",", ":")))
+
+def _orjson() -> JsonBackend:
+    import orjson
+    return JsonBackend("orjson", orjson.loads, lambda obj: orjson.dumps(obj).decode())
+
+def _ujson() -> JsonBackend:
+    import ujson
+    return JsonBackend("ujson", ujson.loads, ujson.dumps)
+
+# the optional backends, fastest first, each is only imported when requested
+BACKENDS = {
+    "orjson": _orjson,
+    "ujson": _ujson,
+    "stdlib": _stdlib,
+}
+
+def get_json_backend(name: str = "stdlib") -> JsonBackend:
+    """
+    returns the JSON backend called name, one of "stdlib", "orjson" or "ujson"
+
+    "auto" returns the fastest one that is installed, falling back to stdlib
+
+    raises ImportError if the requested backend is not installed
+    """
+    if name == "auto":
+        for factory in BACKENDS.values():
+            try:
+                return factory()
+            except ImportError:
+                continue
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend {name!r}, expected one of: auto, {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+import threading
+import time
+
+class ResponseMemo(object):
+    """
+    Thread safe in-process memo of hydrated response objects, keyed by the canonical request (method, url, body)
+
+    Unlike the requests_cache layer a hit costs no disk I/O, JSON decoding or object construction.
+    The cached objects are shared between callers, so they should be treated as read only.
+
+    maxSize: the number of responses kept, the least recently used one is evicted past this
+
+    ttl: seconds a response stays valid, None to keep responses until they are evicted
+    """
+    def __init__(self, maxSize: int = 1024, ttl: float|None = 300) -> None:
+        if maxSize < 1:
+            raise ValueError("maxSize must be at least 1")
+        self.maxSize: int = maxSize
+        self.ttl: float|None = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__lock = threading.Lock()
+        self.__entries: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def key(method: str, url: str, data: str|None = None) -> tuple:
+        return (method, url, data)
+
+    def get(self, key: tuple):
+        """ returns the memoised response for key, or None when it is missing or expired """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > time.monotonic():
+                    self.__entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.__entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, value) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self.__lock:
+            self.__entries[key] = (expires, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maxSize:
+                self.__entries.popitem(last=False)
+
+    def invalidate(self, key: tuple) -> None:
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
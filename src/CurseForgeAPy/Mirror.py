@@ -0,0 +1,264 @@
+from CurseForgeAPy.CFAPI import CurseForgeAPI, _next_page
+from CurseForgeAPy.Endpoints import MAX_PAGE_SIZE, PAGINATION_LIMIT
+from CurseForgeAPy.SchemaClasses import ApiResponseCode, Category, File, FileIndex, Mod, ModLoaderType, ModSearchSortField, SortOrder, create_datetime
+from CurseForgeAPy.Sharding import IncompleteResultsError, ShardPlanner
+from contextlib import closing
+from datetime import datetime, timedelta
+import sqlite3
+import threading
+
+_EPOCH = datetime(1970, 1, 1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mods (
+    id INTEGER PRIMARY KEY, gameId INTEGER NOT NULL, classId INTEGER, primaryCategoryId INTEGER,
+    name TEXT NOT NULL, slug TEXT NOT NULL, summary TEXT, downloadCount INTEGER, gamePopularityRank INTEGER,
+    dateModified INTEGER NOT NULL, json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS mods_game ON mods (gameId, dateModified);
+CREATE INDEX IF NOT EXISTS mods_slug ON mods (gameId, slug);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, modId INTEGER NOT NULL, fileName TEXT NOT NULL, releaseType INTEGER NOT NULL,
+    fileDate INTEGER, fileLength INTEGER, fileFingerprint INTEGER, json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_mod ON files (modId);
+CREATE INDEX IF NOT EXISTS files_fingerprint ON files (fileFingerprint);
+CREATE TABLE IF NOT EXISTS file_indexes (
+    modId INTEGER NOT NULL, gameVersion TEXT NOT NULL, fileId INTEGER NOT NULL, filename TEXT NOT NULL,
+    releaseType INTEGER NOT NULL, modLoader INTEGER NOT NULL, gameVersionTypeId INTEGER
+);
+CREATE INDEX IF NOT EXISTS file_indexes_mod ON file_indexes (modId);
+CREATE INDEX IF NOT EXISTS file_indexes_version ON file_indexes (gameVersion, modLoader);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY, gameId INTEGER NOT NULL, name TEXT NOT NULL, slug TEXT NOT NULL,
+    classId INTEGER, parentCategoryId INTEGER, isClass INTEGER, json TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS mod_categories (
+    modId INTEGER NOT NULL, categoryId INTEGER NOT NULL, PRIMARY KEY (modId, categoryId)
+);
+CREATE INDEX IF NOT EXISTS mod_categories_category ON mod_categories (categoryId);
+CREATE TABLE IF NOT EXISTS sync_state (
+    gameId INTEGER PRIMARY KEY, checkpoint INTEGER, pending INTEGER, crawlClassId INTEGER, crawlIndex INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+def _millis(value: datetime|int|str|None) -> int|None:
+    """ a timestamp as integer milliseconds since the Unix epoch, whether set_epoch_timestamps is on or not """
+    if isinstance(value, str):
+        value = create_datetime(value)
+    if value is None or isinstance(value, int):
+        return value
+    return (value - _EPOCH) // timedelta(milliseconds=1)
+
+def _next_class(classes: list[int], classId: int|None) -> tuple[int, int]|None:
+    """ the crawl after the one of classId, None when the crawl of every mod or of the last class is done """
+    if classId is None:
+        return None
+    following = [other for other in classes if other > classId]
+    return (following[0], 0) if following else None
+
+class CatalogMirror(object):
+    """
+    A local SQLite copy of a game's mod catalog, kept up to date incrementally
+
+    sync crawls searchMods sorted by LastUpdated, newest first, into normalised mods, files, file_indexes, categories
+    and mod_categories tables, so the catalog can be queried offline with index lookups instead of API calls.
+    Every page is committed together with the crawl position, so an interrupted sync resumes where it stopped.
+    Once a crawl completes, the dateModified of the newest mod it saw becomes the checkpoint, and later syncs stop
+    at the first mod older than it, only fetching what changed since.
+
+    searchMods cannot page past 10,000 results. A crawl that reaches that limit before the checkpoint carries on
+    class by class, each crawled the same way, when the classes add up to every mod of the game. A crawl that still
+    cannot reach the checkpoint, like the first sync of a class with more than 10,000 mods, enumerates all of its
+    mods with a ShardPlanner instead. Mods removed from CurseForge are not removed from the mirror.
+
+    filename: the sqlite file, in WAL mode so it can be read while a sync is writing
+
+    truncated: whether the last sync could not reach every mod modified since the checkpoint
+
+        mirror = CatalogMirror(cf, 432, "minecraft.sqlite")
+        mirror.sync()
+        mod = mirror.getMod(238222)
+    """
+    def __init__(self, client: CurseForgeAPI, gameId: int, filename: str = "CurseForgeAPY-Catalog.sqlite", pageSize: int = MAX_PAGE_SIZE) -> None:
+        self.client: CurseForgeAPI = client
+        self.gameId: int = int(gameId)
+        self.filename: str = filename
+        self.pageSize: int = pageSize
+        self.truncated: bool = False
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(filename, check_same_thread=False)
+        with self.__lock, self.__db:
+            self.__db.execute("PRAGMA journal_mode=WAL")
+            self.__db.executescript(_SCHEMA)
+            self.__db.execute("INSERT OR IGNORE INTO sync_state (gameId) VALUES (?)", (self.gameId,))
+
+    @property
+    def checkpoint(self) -> int|None:
+        """ the dateModified, in epoch milliseconds, up to which the mirror is complete, None before the first full sync """
+        return self.__state()[0]
+
+    def __state(self) -> tuple[int|None, int|None, int|None, int]:
+        with self.__lock, closing(self.__db.execute("SELECT checkpoint, pending, crawlClassId, crawlIndex FROM sync_state WHERE gameId = ?", (self.gameId,))) as rows:
+            return rows.fetchone()
+
+    def sync(self) -> int|ApiResponseCode:
+        """
+        fetches every mod modified since the checkpoint, resuming an interrupted crawl first
+
+        returns the number of mods stored, or the status of the failed request, the next sync resumes from that page.
+        Raises IncompleteResultsError when even a ShardPlanner cannot reach every mod, see truncated, the mods it
+        got are stored but the checkpoint stays where it was so that the next sync looks for the others again
+        """
+        categories = self.client.getCategories(self.gameId)
+        if isinstance(categories, ApiResponseCode):
+            return categories
+        with self.__lock, self.__db:
+            self.__storeCategories(categories.data)
+        classes = sorted(category.id for category in categories.data if category.isClass)
+        checkpoint, pending, classId, index = self.__state()
+        stored = 0
+        self.truncated = False
+        # the crawl in progress, all mods of the game or of classId, None once the sync is complete
+        crawl = (classId, index)
+        while crawl is not None:
+            classId, index = crawl
+            if index >= PAGINATION_LIMIT:
+                # searchMods could not page far enough, enumerate every mod of the crawl instead
+                try:
+                    mods = ShardPlanner(self.client).searchAll(self.gameId, classId=classId)
+                except IncompleteResultsError as e:
+                    self.truncated = True
+                    with self.__lock, self.__db:
+                        self.__storeMods(e.results)
+                        self.__db.execute("UPDATE sync_state SET pending = NULL, crawlClassId = NULL, crawlIndex = 0 WHERE gameId = ?", (self.gameId,))
+                    raise
+                if isinstance(mods, ApiResponseCode):
+                    return mods
+                crawl = _next_class(classes, classId)
+            else:
+                response = self.client.searchMods(self.gameId, classId=classId, sortField=ModSearchSortField.LastUpdated, sortOrder=SortOrder.Descending, index=index, pageSize=min(self.pageSize, PAGINATION_LIMIT - index))
+                if isinstance(response, ApiResponseCode):
+                    return response
+                mods = response.data
+                if pending is None and mods:
+                    # the newest mod at the start of the crawl, anything modified after it is picked up by the next sync
+                    pending = _millis(mods[0].dateModified)
+                done = checkpoint is not None and any(_millis(mod.dateModified) < checkpoint for mod in mods)
+                if done:
+                    mods = [mod for mod in mods if _millis(mod.dateModified) >= checkpoint]
+                following = None if done else _next_page(index, self.pageSize, response)
+                if following is not None:
+                    crawl = (classId, following[0])
+                elif done or response.pagination.totalCount <= index + len(response.data):
+                    crawl = _next_class(classes, classId)
+                elif classId is None and classes:
+                    # the limit was reached before the checkpoint, crawl each class when they hold every mod
+                    covered = self.__classTotal(classes)
+                    if isinstance(covered, ApiResponseCode):
+                        return covered
+                    crawl = (classes[0], 0) if covered >= response.pagination.totalCount else (None, PAGINATION_LIMIT)
+                else:
+                    crawl = (classId, PAGINATION_LIMIT)
+            with self.__lock, self.__db:
+                self.__storeMods(mods)
+                if crawl is None:
+                    self.__db.execute("UPDATE sync_state SET checkpoint = COALESCE(?, checkpoint), pending = NULL, crawlClassId = NULL, crawlIndex = 0 WHERE gameId = ?", (pending, self.gameId))
+                else:
+                    self.__db.execute("UPDATE sync_state SET pending = ?, crawlClassId = ?, crawlIndex = ? WHERE gameId = ?", (pending, *crawl, self.gameId))
+            stored += len(mods)
+        return stored
+
+    def __classTotal(self, classes: list[int]) -> int|ApiResponseCode:
+        """ how many mods the classes have together, a mod only ever being in one """
+        total = 0
+        for classId in classes:
+            response = self.client.searchMods(self.gameId, classId=classId, index=0, pageSize=1)
+            if isinstance(response, ApiResponseCode):
+                return response
+            total += response.pagination.totalCount
+        return total
+
+    def store(self, mods: list[Mod]) -> None:
+        """ adds or replaces mods in the mirror without moving the checkpoint, e.g. mods fetched with getMods """
+        with self.__lock, self.__db:
+            self.__storeMods(mods)
+
+    def __storeCategories(self, categories: list[Category]) -> None:
+        encode = self.client.json.encode
+        self.__db.executemany("INSERT OR REPLACE INTO categories VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (
+            (category.id, category.gameId, category.name, category.slug, category.classId, category.parentCategoryId, category.isClass, encode(category))
+            for category in categories))
+
+    def __storeMods(self, mods: list[Mod]) -> None:
+        if not mods:
+            return
+        encode = self.client.json.encode
+        db = self.__db
+        ids = [(mod.id,) for mod in mods]
+        db.executemany("DELETE FROM file_indexes WHERE modId = ?", ids)
+        db.executemany("DELETE FROM mod_categories WHERE modId = ?", ids)
+        db.executemany("INSERT OR REPLACE INTO mods VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+            (mod.id, mod.gameId, mod.classId, mod.primaryCategoryId, mod.name, mod.slug, mod.summary, mod.downloadCount, mod.gamePopularityRank, _millis(mod.dateModified), encode(mod))
+            for mod in mods))
+        db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (
+            (file.id, file.modId, file.fileName, file.releaseType.value, _millis(file.fileDate), file.fileLength, file.fileFingerprint, encode(file))
+            for mod in mods for file in mod.latestFiles))
+        db.executemany("INSERT INTO file_indexes VALUES (?, ?, ?, ?, ?, ?, ?)", (
+            (mod.id, index.gameVersion, index.fileId, index.filename, index.releaseType.value, index.modLoader.value, index.gameVersionTypeId)
+            for mod in mods for index in mod.latestFilesIndexes))
+        db.executemany("INSERT OR IGNORE INTO mod_categories VALUES (?, ?)", (
+            (mod.id, category.id) for mod in mods for category in mod.categories))
+
+    def __rows(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self.__lock, closing(self.__db.execute(sql, params)) as rows:
+            return rows.fetchall()
+
+    def __mods(self, rows: list[tuple]) -> list[Mod]:
+        loads = self.client.json.loads
+        return [Mod.from_dict(loads(row[0])) for row in rows]
+
+    def getMod(self, modId: int) -> Mod|None:
+        mods = self.__mods(self.__rows("SELECT json FROM mods WHERE id = ?", (int(modId),)))
+        return mods[0] if mods else None
+
+    def getMods(self, modIds: list[int]) -> list[Mod]:
+        """ the mirrored mods among modIds, in the order of modIds """
+        byId = {mod.id: mod for mod in self.__mods(self.__rows(f"SELECT json FROM mods WHERE id IN ({','.join('?' * len(modIds))})", tuple(map(int, modIds))))} if modIds else {}
+        return [byId[modId] for modId in map(int, modIds) if modId in byId]
+
+    def getModBySlug(self, slug: str) -> Mod|None:
+        mods = self.__mods(self.__rows("SELECT json FROM mods WHERE gameId = ? AND slug = ?", (self.gameId, slug)))
+        return mods[0] if mods else None
+
+    def getModsInCategory(self, categoryId: int) -> list[Mod]:
+        """ the mods in categoryId, most downloaded first """
+        return self.__mods(self.__rows("SELECT mods.json FROM mod_categories JOIN mods ON mods.id = mod_categories.modId WHERE categoryId = ? ORDER BY downloadCount DESC", (int(categoryId),)))
+
+    def getFile(self, fileId: int) -> File|None:
+        loads = self.client.json.loads
+        rows = self.__rows("SELECT json FROM files WHERE id = ?", (int(fileId),))
+        return File.from_dict(loads(rows[0][0])) if rows else None
+
+    def getFileIndexes(self, modId: int, gameVersion: str|None = None, modLoaderType: ModLoaderType|None = None) -> list[FileIndex]:
+        """ the latestFilesIndexes of a mod, optionally only those for gameVersion and modLoaderType """
+        sql = "SELECT gameVersion, fileId, filename, releaseType, modLoader, gameVersionTypeId FROM file_indexes WHERE modId = ?"
+        params = [int(modId)]
+        if gameVersion is not None:
+            sql += " AND gameVersion = ?"
+            params.append(gameVersion)
+        if modLoaderType is not None:
+            sql += " AND modLoader = ?"
+            params.append(modLoaderType.value)
+        return [FileIndex(gameVersion, fileId, filename, releaseType, modLoader, gameVersionTypeId) for gameVersion, fileId, filename, releaseType, modLoader, gameVersionTypeId in self.__rows(sql, tuple(params))]
+
+    def getCategories(self) -> list[Category]:
+        loads = self.client.json.loads
+        return [Category.from_dict(loads(row[0])) for row in self.__rows("SELECT json FROM categories WHERE gameId = ?", (self.gameId,))]
+
+    def __len__(self) -> int:
+        return self.__rows("SELECT COUNT(*) FROM mods WHERE gameId = ?", (self.gameId,))[0][0]
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__db.close()
@@ -0,0 +1,181 @@
+import asyncio
+import email.utils
+import threading
+import time
+
+# coroutines cannot wait on the limiter's threading.Condition, so while every slot is taken they re-check this often
+ASYNC_POLL_INTERVAL = 0.01
+
+def parse_retry_after(value: str|float|None) -> float|None:
+    """ seconds to wait from a Retry-After header, which is either a number of seconds or an HTTP date """
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+class RateLimiter(object):
+    """
+    Token bucket rate limiter with adaptive (AIMD) concurrency, shared by every thread and coroutine using a client
+
+    Every request takes a token from a bucket refilled at rate tokens per second, and one of the concurrency slots.
+    A 429 or 5xx response multiplies the number of slots by decrease, at most once every cooldown seconds,
+    every other response grows it by 1/concurrency, so by one slot per full window of successful requests.
+    A 429 also pauses all requests until its Retry-After has passed, defaultRetryAfter seconds when the header is missing.
+    Clients look a request up in their cache before waiting, a response served from the cache after all hands its token back,
+    neither affects concurrency.
+
+    rate: tokens added to the bucket per second
+
+    burst: the most tokens the bucket holds, defaults to rate
+
+    maxConcurrency: the most requests in flight at once, also the starting concurrency
+
+    minConcurrency: concurrency is never decreased below this
+
+    The time each request waited for its token and slot is added to waits, totalWait and maxWait.
+    """
+    def __init__(self, rate: float = 10, burst: float|None = None, maxConcurrency: int = 16, minConcurrency: int = 1, decrease: float = 0.5, cooldown: float = 1.0, defaultRetryAfter: float = 1.0) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if not 1 <= minConcurrency <= maxConcurrency:
+            raise ValueError("concurrency limits must satisfy 1 <= minConcurrency <= maxConcurrency")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.rate: float = rate
+        self.burst: float = max(1.0, rate if burst is None else burst)
+        self.maxConcurrency: int = maxConcurrency
+        self.minConcurrency: int = minConcurrency
+        self.decrease: float = decrease
+        self.cooldown: float = cooldown
+        self.defaultRetryAfter: float = defaultRetryAfter
+        self.concurrency: float = float(maxConcurrency)
+        self.inFlight: int = 0
+        self.requests: int = 0
+        self.throttled: int = 0
+        self.errors: int = 0
+        self.waits: int = 0
+        self.totalWait: float = 0.0
+        self.maxWait: float = 0.0
+        self.__tokens: float = self.burst
+        self.__refilled: float = time.monotonic()
+        self.__pausedUntil: float = 0.0
+        self.__lastDecrease: float = float("-inf")
+        self.__condition = threading.Condition()
+
+    @property
+    def averageWait(self) -> float:
+        return self.totalWait / self.waits if self.waits else 0.0
+
+    @property
+    def pausedFor(self) -> float:
+        """ seconds until the pause set by the last 429 ends """
+        return max(0.0, self.__pausedUntil - time.monotonic())
+
+    def __try_acquire(self, now: float) -> float|None:
+        """ takes a token and a slot and returns 0, or the seconds to wait before trying again, None to wait for a release """
+        if now < self.__pausedUntil:
+            return self.__pausedUntil - now
+        self.__tokens = min(self.burst, self.__tokens + (now - self.__refilled) * self.rate)
+        self.__refilled = now
+        if self.inFlight >= int(self.concurrency):
+            return None
+        if self.__tokens < 1:
+            return (1 - self.__tokens) / self.rate
+        self.__tokens -= 1
+        self.inFlight += 1
+        return 0.0
+
+    def __record_wait(self, waited: float) -> float:
+        self.waits += 1
+        self.totalWait += waited
+        self.maxWait = max(self.maxWait, waited)
+        return waited
+
+    def __wait_for(self, now: float, delay: float|None, end: float|None) -> float|None:
+        """ how long to wait for the delay __try_acquire returned, None when the request cannot be sent by end """
+        if end is None:
+            return delay
+        if now >= end or (delay is not None and now + delay > end):
+            return None
+        return end - now if delay is None else delay
+
+    def acquire(self, timeout: float|None = None) -> float|None:
+        """
+        blocks until a request may be sent, returning the seconds waited, every acquire must be followed by a release
+
+        timeout: the most seconds to wait, None is returned without acquiring when the request could not be sent in
+        time, straight away when a pause or the next token is further away than that
+        """
+        start = time.monotonic()
+        end = None if timeout is None else start + timeout
+        with self.__condition:
+            while True:
+                now = time.monotonic()
+                delay = self.__try_acquire(now)
+                if delay == 0:
+                    return self.__record_wait(now - start)
+                wait = self.__wait_for(now, delay, end)
+                if wait is None and end is not None:
+                    return None
+                self.__condition.wait(wait)
+
+    async def acquireAsync(self, timeout: float|None = None) -> float|None:
+        """ coroutine version of acquire """
+        start = time.monotonic()
+        end = None if timeout is None else start + timeout
+        while True:
+            with self.__condition:
+                now = time.monotonic()
+                delay = self.__try_acquire(now)
+                if delay == 0:
+                    return self.__record_wait(now - start)
+            wait = self.__wait_for(now, delay, end)
+            if wait is None and end is not None:
+                return None
+            if delay is None:
+                wait = ASYNC_POLL_INTERVAL if wait is None else min(ASYNC_POLL_INTERVAL, wait)
+            await asyncio.sleep(wait)
+
+    def release(self, status: int|None = None, retryAfter: str|float|None = None, fromCache: bool = False) -> None:
+        """
+        frees the slot taken by acquire and adapts to the response
+
+        status: the HTTP status of the response, None when the request failed without one
+
+        retryAfter: the Retry-After header of the response
+
+        fromCache: whether the response was served from the cache without reaching the API
+        """
+        with self.__condition:
+            self.inFlight -= 1
+            now = time.monotonic()
+            if fromCache:
+                self.__tokens = min(self.burst, self.__tokens + 1)
+            elif status is not None:
+                self.requests += 1
+                if status == 429 or status >= 500:
+                    if status == 429:
+                        self.throttled += 1
+                        wait = parse_retry_after(retryAfter)
+                        self.__pausedUntil = max(self.__pausedUntil, now + (self.defaultRetryAfter if wait is None else wait))
+                        # the bucket starts refilling from empty once the pause is over
+                        self.__tokens = 0.0
+                        self.__refilled = self.__pausedUntil
+                    else:
+                        self.errors += 1
+                    if now - self.__lastDecrease >= self.cooldown:
+                        self.concurrency = max(float(self.minConcurrency), self.concurrency * self.decrease)
+                        self.__lastDecrease = now
+                else:
+                    self.concurrency = min(float(self.maxConcurrency), self.concurrency + 1 / self.concurrency)
+            self.__condition.notify_all()
+
+    def __repr__(self) -> str:
+        return f"RateLimiter(rate={self.rate}, concurrency={int(self.concurrency)}/{self.maxConcurrency}, inFlight={self.inFlight})"
@@ -0,0 +1,192 @@
+from CurseForgeAPy.CFAPI import CurseForgeAPI
+from CurseForgeAPy.Compatibility import ANY_RELEASE_TYPE, CompatibilityIndex
+from CurseForgeAPy.SchemaClasses import ApiResponseCode, File, FileIndex, FileRelationType, FileReleaseType, Mod, ModLoaderType
+
+class InstallPlan(object):
+    """
+    The files to install for a set of root mods and everything they depend on
+
+    files: the chosen File of every mod in the plan, keyed by modId
+
+    order: the files in install order, every file after the files it requires (mods in a cycle are kept together)
+
+    requiredBy: the mods that pulled each mod into the plan, empty for the roots
+
+    notFound: mod ids CurseForge did not return
+
+    noCompatibleFile: mods with no file for the game version and mod loader
+
+    conflicts: (modId, incompatibleModId) pairs where a file in the plan declares another mod in the plan Incompatible
+
+    cycles: groups of mods requiring each other, each group in the order it was found
+
+    optional: optional dependencies that were not followed
+
+    requests: how many getMods/getFiles calls resolving took
+    """
+    def __init__(self) -> None:
+        self.files: dict[int, File] = {}
+        self.order: list[File] = []
+        self.requiredBy: dict[int, list[int]] = {}
+        self.notFound: list[int] = []
+        self.noCompatibleFile: list[int] = []
+        self.conflicts: list[tuple[int, int]] = []
+        self.cycles: list[list[int]] = []
+        self.optional: list[int] = []
+        self.requests: int = 0
+
+    @property
+    def ok(self) -> bool:
+        """ whether every mod could be resolved and nothing in the plan conflicts """
+        return not (self.notFound or self.noCompatibleFile or self.conflicts)
+
+    def __repr__(self) -> str:
+        return f"InstallPlan({len(self.files)} files, {len(self.notFound) + len(self.noCompatibleFile)} unresolved, {len(self.conflicts)} conflicts, {len(self.cycles)} cycles)"
+
+class DependencyResolver(object):
+    """
+    Resolves root mods and their transitive dependencies into an InstallPlan
+
+    The dependency graph is walked breadth first, each level costing one batched getMods call to pick a file per mod
+    from Mod.latestFilesIndexes and one batched getFiles call for those files' dependencies, so a closure is resolved
+    in two requests per level of depth rather than one per mod.
+
+    gameVersion: the game version files must support, e.g. "1.19.2"
+
+    modLoaderType: the loader files must support, None to accept any
+
+    releaseTypes: the release types that may be picked, in order of preference
+
+    includeOptional: follow OptionalDependency relations as well as RequiredDependency ones
+
+    compatibility: the CompatibilityIndex files are picked with, every mod looked up is added to it
+
+        resolver = DependencyResolver(cf, "1.19.2", ModLoaderType.Forge)
+        plan = resolver.resolve([238222, 306612])
+    """
+    def __init__(self, client: CurseForgeAPI, gameVersion: str, modLoaderType: ModLoaderType|None = None, releaseTypes: tuple[FileReleaseType, ...] = ANY_RELEASE_TYPE, includeOptional: bool = False, compatibility: CompatibilityIndex|None = None) -> None:
+        self.client: CurseForgeAPI = client
+        self.gameVersion: str = gameVersion
+        self.modLoaderType: ModLoaderType|None = modLoaderType
+        self.releaseTypes: tuple[FileReleaseType, ...] = tuple(releaseTypes)
+        self.includeOptional: bool = includeOptional
+        self.compatibility: CompatibilityIndex = compatibility if compatibility is not None else CompatibilityIndex()
+
+    def pickFile(self, mod: Mod) -> FileIndex|None:
+        """ the best file index of mod for the game version and loader, None when it has none """
+        self.compatibility.add(mod)
+        return self.compatibility.bestFile(mod.id, self.gameVersion, self.modLoaderType, self.releaseTypes)
+
+    def resolve(self, modIds: list[int]) -> InstallPlan|ApiResponseCode:
+        """ resolves modIds and their dependencies, returning the status of the first failed request """
+        plan = InstallPlan()
+        seen = set()
+        level = []
+        for modId in map(int, modIds):
+            if modId not in seen:
+                seen.add(modId)
+                plan.requiredBy[modId] = []
+                level.append(modId)
+        requires: dict[int, list[int]] = {}
+        incompatible: dict[int, list[int]] = {}
+        optional = {}
+        while level:
+            mods = self.client.getMods(level)
+            plan.requests += 1
+            if isinstance(mods, ApiResponseCode):
+                return mods
+            found = {mod.id: mod for mod in mods.data}
+            picked = {}
+            for modId in level:
+                if modId not in found:
+                    plan.notFound.append(modId)
+                    continue
+                index = self.pickFile(found[modId])
+                if index is None:
+                    plan.noCompatibleFile.append(modId)
+                else:
+                    picked[index.fileId] = modId
+            level = []
+            if not picked:
+                break
+            files = self.client.getFiles(list(picked))
+            plan.requests += 1
+            if isinstance(files, ApiResponseCode):
+                return files
+            returned = {file.id for file in files.data}
+            plan.notFound.extend(modId for fileId, modId in picked.items() if fileId not in returned)
+            for file in files.data:
+                plan.files[file.modId] = file
+                requires[file.modId] = []
+                for dependency in file.dependencies:
+                    if dependency.relationType == FileRelationType.Incompatible:
+                        incompatible.setdefault(file.modId, []).append(dependency.modId)
+                        continue
+                    if dependency.relationType == FileRelationType.OptionalDependency and not self.includeOptional:
+                        optional.setdefault(dependency.modId, None)
+                        continue
+                    if dependency.relationType not in (FileRelationType.RequiredDependency, FileRelationType.OptionalDependency):
+                        # embedded libraries and includes ship inside the file, tools are not installed
+                        continue
+                    requires[file.modId].append(dependency.modId)
+                    if dependency.modId not in seen:
+                        seen.add(dependency.modId)
+                        plan.requiredBy[dependency.modId] = []
+                        level.append(dependency.modId)
+                    plan.requiredBy[dependency.modId].append(file.modId)
+        plan.optional = [modId for modId in optional if modId not in seen]
+        plan.conflicts = [(modId, other) for modId, others in incompatible.items() for other in others if other in plan.files]
+        plan.order, plan.cycles = _install_order(plan.files, requires)
+        return plan
+
+def _install_order(files: dict[int, File], requires: dict[int, list[int]]) -> tuple[list[File], list[list[int]]]:
+    """
+    orders files so each comes after the files it requires, and finds the cycles among them
+
+    Tarjan's strongly connected components, which come out with every component after those it depends on.
+    Iterative so that long dependency chains cannot hit the recursion limit.
+    """
+    order = []
+    cycles = []
+    indexes = {}
+    lowlinks = {}
+    stack = []
+    onStack = set()
+    for root in files:
+        if root in indexes:
+            continue
+        work = [(root, iter(requires.get(root, ())))]
+        indexes[root] = lowlinks[root] = len(indexes)
+        stack.append(root)
+        onStack.add(root)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in files:
+                    continue
+                if child not in indexes:
+                    indexes[child] = lowlinks[child] = len(indexes)
+                    stack.append(child)
+                    onStack.add(child)
+                    work.append((child, iter(requires.get(child, ()))))
+                    break
+                if child in onStack:
+                    lowlinks[node] = min(lowlinks[node], indexes[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+                if lowlinks[node] == indexes[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        onStack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    component.reverse()
+                    if len(component) > 1 or node in requires.get(node, ()):
+                        cycles.append(component)
+                    order.extend(files[member] for member in component)
+    return order, cycles
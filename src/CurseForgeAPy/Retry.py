@@ -0,0 +1,165 @@
+from CurseForgeAPy.RateLimiter import parse_retry_after
+import random
+import requests
+import threading
+import time
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+RETRYABLE_STATUSES = frozenset((429, 500, 502, 503, 504))
+# connection resets and timeouts of both clients, TimeoutError also covers asyncio timeouts
+RETRYABLE_EXCEPTIONS: tuple = (requests.ConnectionError, requests.Timeout, TimeoutError) + ((aiohttp.ClientConnectionError,) if aiohttp is not None else ())
+# what an attempt sent with the time left before the deadline as its timeout raises when that runs out
+TIMEOUT_EXCEPTIONS: tuple = (requests.Timeout, TimeoutError)
+
+class RetryPolicy(object):
+    """
+    Which failed requests are sent again, how often and after how long
+
+    The wait before attempt n + 1 is drawn uniformly from [0, min(maxBackoff, backoff * 2 ** (n - 1))] ("full jitter"),
+    so clients that failed together do not retry together. A Retry-After header makes the wait at least that long.
+
+    maxAttempts: the most times a request is sent, including the first
+
+    statuses: the HTTP statuses that are retried
+
+    exceptions: the exception types that are retried, any other exception is raised straight away
+
+    backoff: the base of the exponential backoff, in seconds
+
+    maxBackoff: the most a single backoff can be, in seconds
+
+    jitter: randomise each backoff, when False the full backoff is always waited
+
+    deadline: seconds a call may take across all of its attempts, waiting for the rate limiter included, each attempt
+    is sent with the remaining time as its timeout and no attempt is made that could not start before it. A call that
+    runs out of time returns ApiResponseCode.GatewayTimeout, whether waiting, between attempts or while an attempt
+    is in flight. None for no deadline
+    """
+    def __init__(self, maxAttempts: int = 3, statuses = RETRYABLE_STATUSES, exceptions: tuple = RETRYABLE_EXCEPTIONS, backoff: float = 0.5, maxBackoff: float = 30, jitter: bool = True, deadline: float|None = None) -> None:
+        if maxAttempts < 1:
+            raise ValueError("maxAttempts must be at least 1")
+        self.maxAttempts: int = maxAttempts
+        self.statuses: frozenset[int] = frozenset(statuses)
+        self.exceptions: tuple = tuple(exceptions)
+        self.backoff: float = backoff
+        self.maxBackoff: float = maxBackoff
+        self.jitter: bool = jitter
+        self.deadline: float|None = deadline
+
+    def retryable(self, status: int|None = None, exception: BaseException|None = None) -> bool:
+        if exception is not None:
+            return isinstance(exception, self.exceptions)
+        return status in self.statuses
+
+    def timeout(self, started: float) -> float|None:
+        """ the time left before the deadline of a call started at started (time.monotonic), None without a deadline """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - (time.monotonic() - started))
+
+    def deadlineAt(self, started: float) -> float|None:
+        """ the time.monotonic by which a call started at started has to be done, None without a deadline """
+        return None if self.deadline is None else started + self.deadline
+
+    def expired(self, attempt: int, exception: BaseException) -> bool:
+        """ whether a call giving up on a retryable exception did so because of the deadline rather than maxAttempts """
+        if self.deadline is None:
+            return False
+        return attempt < self.maxAttempts or isinstance(exception, TIMEOUT_EXCEPTIONS)
+
+    def nextDelay(self, attempt: int, started: float, retryAfter: str|float|None = None) -> float|None:
+        """ seconds to wait before sending attempt + 1, or None when the call should give up """
+        if attempt >= self.maxAttempts:
+            return None
+        delay = min(self.maxBackoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        wait = parse_retry_after(retryAfter)
+        if wait is not None:
+            delay = max(delay, wait)
+        remaining = self.timeout(started)
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+
+class CircuitBreaker(object):
+    """
+    Fails calls fast while the API is degraded, instead of letting every caller wait on its own timeouts and retries
+
+    After failureThreshold failures in a row the circuit opens and calls are refused for resetTimeout seconds.
+    It then lets halfOpenCalls trial calls through, the first success closes the circuit and a failure opens it again.
+    Exceptions and the statuses in failureStatuses count as failures, 429 does not as it is the rate limiter's concern.
+
+    Thread safe, one breaker can be shared by several clients talking to the same API.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failureThreshold: int = 5, resetTimeout: float = 30, halfOpenCalls: int = 1, failureStatuses = (500, 502, 503, 504)) -> None:
+        if failureThreshold < 1:
+            raise ValueError("failureThreshold must be at least 1")
+        self.failureThreshold: int = failureThreshold
+        self.resetTimeout: float = resetTimeout
+        self.halfOpenCalls: int = halfOpenCalls
+        self.failureStatuses: frozenset[int] = frozenset(failureStatuses)
+        self.failures: int = 0
+        self.rejected: int = 0
+        self.__state: str = self.CLOSED
+        self.__openedAt: float = 0.0
+        self.__trials: int = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self.__lock:
+            self.__refresh(time.monotonic())
+            return self.__state
+
+    def __refresh(self, now: float) -> None:
+        if self.__state == self.OPEN and now - self.__openedAt >= self.resetTimeout:
+            self.__state = self.HALF_OPEN
+            self.__trials = 0
+
+    def allow(self) -> bool:
+        """ whether a call may be sent now, every allowed call must be followed by record or cancel """
+        with self.__lock:
+            self.__refresh(time.monotonic())
+            if self.__state == self.CLOSED:
+                return True
+            if self.__state == self.HALF_OPEN and self.__trials < self.halfOpenCalls:
+                self.__trials += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def cancel(self) -> None:
+        """ hands back a call allowed by allow that was not sent after all, without recording an outcome """
+        with self.__lock:
+            if self.__state == self.HALF_OPEN and self.__trials > 0:
+                self.__trials -= 1
+
+    def isFailure(self, status: int|None = None, exception: BaseException|None = None) -> bool:
+        return exception is not None or status in self.failureStatuses
+
+    def record(self, failed: bool) -> None:
+        with self.__lock:
+            if not failed:
+                self.failures = 0
+                self.__state = self.CLOSED
+                return
+            self.failures += 1
+            if self.__state == self.HALF_OPEN or self.failures >= self.failureThreshold:
+                self.__state = self.OPEN
+                self.__openedAt = time.monotonic()
+
+    def reset(self) -> None:
+        """ closes the circuit """
+        self.record(False)
+
+    def __repr__(self) -> str:
+        return f"CircuitBreaker({self.state}, failures={self.failures})"
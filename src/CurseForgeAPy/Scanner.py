@@ -0,0 +1,178 @@
+from CurseForgeAPy.CFAPI import CurseForgeAPI
+from CurseForgeAPy.Fingerprint import fingerprintFile
+from CurseForgeAPy.SchemaClasses import ApiResponseCode, FingerprintFuzzyMatch, FingerprintMatch, FolderFingerprint, GetFingerprintMatchesRequestBody, GetFuzzyMatchesRequestBody
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+import os
+import sqlite3
+import threading
+
+# sqlite limits the number of ? parameters in one statement, 999 in older versions
+_SQL_BATCH = 500
+
+class FingerprintCache(object):
+    """
+    Persistent sqlite store of file fingerprints, keyed by (path, size, mtime)
+
+    A file whose size or modification time changed no longer matches its entry, so it is hashed again.
+    Thread safe, the database is in WAL mode like the response cache so several processes can share it.
+
+    filename: the sqlite file, ":memory:" keeps the cache for the life of the object only
+    """
+    def __init__(self, filename: str = "CurseForgeAPY-Fingerprints.sqlite") -> None:
+        self.filename: str = filename
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(filename, check_same_thread=False)
+        with self.__lock, self.__db:
+            self.__db.execute("PRAGMA journal_mode=WAL")
+            self.__db.execute("CREATE TABLE IF NOT EXISTS fingerprints (path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime INTEGER NOT NULL, fingerprint INTEGER NOT NULL)")
+
+    def get(self, stats: dict[str, tuple[int, int]]) -> dict[str, int]:
+        """ the cached fingerprint of every path in stats whose (size, mtime) still matches its entry """
+        paths = list(stats)
+        found = {}
+        with self.__lock:
+            for i in range(0, len(paths), _SQL_BATCH):
+                batch = paths[i:i + _SQL_BATCH]
+                rows = self.__db.execute(f"SELECT path, size, mtime, fingerprint FROM fingerprints WHERE path IN ({','.join('?' * len(batch))})", batch)
+                for path, size, mtime, fingerprint in rows:
+                    if stats[path] == (size, mtime):
+                        found[path] = fingerprint
+        return found
+
+    def put(self, entries: dict[str, tuple[int, int, int]]) -> None:
+        """ stores the (size, mtime, fingerprint) of every path in entries """
+        with self.__lock, self.__db:
+            self.__db.executemany("INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?)", ((path, *entry) for path, entry in entries.items()))
+
+    def forget(self, paths: list[str]) -> None:
+        """ removes the entries of paths, e.g. of files that were deleted """
+        with self.__lock, self.__db:
+            self.__db.executemany("DELETE FROM fingerprints WHERE path = ?", ((path,) for path in paths))
+
+    def clear(self) -> None:
+        with self.__lock, self.__db:
+            self.__db.execute("DELETE FROM fingerprints")
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__db.close()
+
+    def __len__(self) -> int:
+        with self.__lock, closing(self.__db.execute("SELECT COUNT(*) FROM fingerprints")) as rows:
+            return rows.fetchone()[0]
+
+class ScanResult(object):
+    """
+    What was found in a scanned folder
+
+    fingerprints: the fingerprint of every file scanned, keyed by path
+
+    matches: the exact FingerprintMatch of every file directly in the folder, None when CurseForge does not know it
+
+    fuzzyMatches: the FingerprintFuzzyMatch of every subfolder (module folder), None when nothing matched
+
+    status: ApiResponseCode.OK, or the status of the first failed match request in which case the matches are incomplete
+
+    hashed: how many files had to be fingerprinted, the rest came from the cache
+    """
+    def __init__(self, fingerprints: dict[str, int], matches: dict[str, FingerprintMatch|None], fuzzyMatches: dict[str, FingerprintFuzzyMatch|None], status: ApiResponseCode, hashed: int) -> None:
+        self.fingerprints: dict[str, int] = fingerprints
+        self.matches: dict[str, FingerprintMatch|None] = matches
+        self.fuzzyMatches: dict[str, FingerprintFuzzyMatch|None] = fuzzyMatches
+        self.status: ApiResponseCode = status
+        self.hashed: int = hashed
+
+    @property
+    def unmatched(self) -> list[str]:
+        """ the files and folders CurseForge did not recognise """
+        return [path for path, match in (*self.matches.items(), *self.fuzzyMatches.items()) if match is None]
+
+    def __repr__(self) -> str:
+        found = sum(match is not None for match in self.matches.values())
+        return f"ScanResult({found}/{len(self.matches)} files, {len(self.fuzzyMatches)} folders, {self.status})"
+
+class ModsScanner(object):
+    """
+    Identifies the files of a game instance's mods folder
+
+    Every file is fingerprinted once across a process pool and remembered in a FingerprintCache, so rescanning an
+    unchanged folder only costs a stat per file. Files directly in the folder are looked up with getFingerprintsMatches,
+    each subfolder is looked up as a module folder with getFingerprintsFuzzyMatches, reusing the same fingerprints.
+
+    cache: the FingerprintCache to use, None for one in memory
+
+    maxWorkers: processes hashing files, defaults to the number of CPUs
+
+    extensions: only files ending in one of these are scanned, e.g. (".jar",), None for every file
+
+        scanner = ModsScanner(cf, gameId=432, cache=FingerprintCache("fingerprints.sqlite"), extensions=(".jar",))
+        result = scanner.scan("mods")
+    """
+    def __init__(self, client: CurseForgeAPI, gameId: int, cache: FingerprintCache|None = None, maxWorkers: int|None = None, extensions: tuple[str, ...]|None = None) -> None:
+        self.client: CurseForgeAPI = client
+        self.gameId: int = gameId
+        self.cache: FingerprintCache = cache if cache is not None else FingerprintCache(":memory:")
+        self.maxWorkers: int|None = maxWorkers
+        self.extensions: tuple[str, ...]|None = tuple(extension.lower() for extension in extensions) if extensions is not None else None
+
+    def files(self, directory: str) -> tuple[list[str], dict[str, list[str]]]:
+        """ the files directly in directory, and the files below each of its subfolders by subfolder """
+        files = []
+        folders = {}
+        with os.scandir(directory) as entries:
+            for entry in sorted(entries, key=lambda entry: entry.name):
+                if entry.is_dir():
+                    folders[entry.path] = sorted(os.path.join(root, name) for root, _, names in os.walk(entry.path) for name in names if self.__wanted(name))
+                elif entry.is_file() and self.__wanted(entry.name):
+                    files.append(entry.path)
+        return files, folders
+
+    def __wanted(self, name: str) -> bool:
+        return self.extensions is None or name.lower().endswith(self.extensions)
+
+    def fingerprint(self, paths: list[str]) -> tuple[dict[str, int], int]:
+        """ the fingerprint of every path, hashing only those not in the cache, and how many were hashed """
+        stats = {}
+        for path in paths:
+            stat = os.stat(path)
+            stats[os.path.abspath(path)] = (stat.st_size, stat.st_mtime_ns)
+        fingerprints = self.cache.get(stats)
+        missing = [path for path in stats if path not in fingerprints]
+        if len(missing) > 1 and self.maxWorkers != 1:
+            with ProcessPoolExecutor(max_workers=self.maxWorkers) as pool:
+                hashed = dict(zip(missing, pool.map(fingerprintFile, missing)))
+        else:
+            hashed = {path: fingerprintFile(path) for path in missing}
+        if hashed:
+            self.cache.put({path: (*stats[path], fingerprint) for path, fingerprint in hashed.items()})
+            fingerprints.update(hashed)
+        return {path: fingerprints[os.path.abspath(path)] for path in paths}, len(hashed)
+
+    def scan(self, directory: str) -> ScanResult:
+        """ fingerprints directory and looks up what CurseForge knows about its files and module folders """
+        files, folders = self.files(directory)
+        fingerprints, hashed = self.fingerprint(files + [path for paths in folders.values() for path in paths])
+        status = ApiResponseCode.OK
+        matches = dict.fromkeys(files)
+        if files:
+            response = self.client.getFingerprintsMatches(GetFingerprintMatchesRequestBody([fingerprints[path] for path in files]))
+            if isinstance(response, ApiResponseCode):
+                status = response
+            else:
+                byFingerprint = {match.file.fileFingerprint: match for match in response.data.exactMatches}
+                matches = {path: byFingerprint.get(fingerprints[path]) for path in files}
+        fuzzyMatches = dict.fromkeys(folders)
+        folders = {folder: paths for folder, paths in folders.items() if paths}
+        if folders:
+            body = GetFuzzyMatchesRequestBody(self.gameId, [FolderFingerprint(os.path.basename(folder), [fingerprints[path] for path in paths]) for folder, paths in folders.items()])
+            response = self.client.getFingerprintsFuzzyMatches(body)
+            if isinstance(response, ApiResponseCode):
+                status = response if status == ApiResponseCode.OK else status
+            else:
+                owner = {fingerprints[path]: folder for folder, paths in folders.items() for path in paths}
+                for match in response.data.fuzzyMatches:
+                    folder = next((owner[fingerprint] for fingerprint in match.fingerprints if fingerprint in owner), None)
+                    if folder is not None and fuzzyMatches[folder] is None:
+                        fuzzyMatches[folder] = match
+        return ScanResult(fingerprints, matches, fuzzyMatches, status, hashed)
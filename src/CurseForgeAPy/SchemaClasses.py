@@ -1,38 +1,247 @@
 from __future__ import annotations
 import enum
-from datetime import datetime
-import jsonpickle
-
-def create_datetime(date_string: str) -> datetime:
-    # Find the index of "T"
-    t_index = date_string.index("T")
-
-    # Slice the string into its date and time parts
-    date_part = date_string[:t_index]
-    time_part = date_string[t_index+1:]
-
-    # Split the date and time parts into their individual components
-    year, month, day = date_part.split("-")
-    hour, minute, second = time_part.split(":")
-    second = second[0:2]
-
-    # Parse the microseconds part if it is present
-    if "." in time_part:
-        dot_index = time_part.index(".")
-        microseconds_part = time_part[dot_index+1:-1]
-        date = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second), int(microseconds_part))
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+import json
+
+# When enabled, timestamps are kept as integer milliseconds since the Unix epoch instead of datetime objects
+EPOCH_TIMESTAMPS = False
+
+# how many distinct timestamp strings each parser remembers, many objects of a response share the same timestamps
+TIMESTAMP_CACHE_SIZE = 4096
+
+_EPOCH = datetime(1970, 1, 1)
+_MILLISECOND = timedelta(milliseconds=1)
+_TIMESTAMP = re.compile(r"(\d{4})-(\d{2})-(\d{2})[Tt ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d+))?)?(?:([Zz])|([+-])(\d{2}):?(\d{2}))?")
+
+def set_epoch_timestamps(enabled: bool) -> None:
+    """ make create_datetime return integer epoch milliseconds instead of datetime objects, for objects created from now on """
+    global EPOCH_TIMESTAMPS
+    EPOCH_TIMESTAMPS = bool(enabled)
+
+def _parse_iso8601(date_string: str) -> datetime:
+    """ parses an ISO-8601 timestamp into a naive datetime in UTC """
+    # fast path, the C parser handles the API's usual "...Z" timestamps once the suffix is removed
+    try:
+        date = datetime.fromisoformat(date_string[:-1] if date_string[-1:] in ("Z", "z") else date_string)
+    except ValueError:
+        # before 3.11 fromisoformat only takes 3 or 6 fractional digits
+        pass
     else:
-        date = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
-
+        if date.tzinfo is None:
+            return date
+
+    match = _TIMESTAMP.fullmatch(date_string)
+    if match is None:
+        raise ValueError(f"Invalid ISO-8601 timestamp: {date_string!r}")
+    year, month, day, hour, minute, second, fraction, _, sign, offsetHours, offsetMinutes = match.groups()
+    # the fraction is a decimal, ".5" is 500000 microseconds and digits past the sixth are dropped
+    microsecond = int(fraction[:6].ljust(6, "0")) if fraction else 0
+    date = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second or 0), microsecond)
+    if sign:
+        offset = timedelta(hours=int(offsetHours), minutes=int(offsetMinutes))
+        date = date - offset if sign == "+" else date + offset
     return date
 
+_cached_datetime = lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)(_parse_iso8601)
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _cached_epoch(date_string: str) -> int:
+    return (_parse_iso8601(date_string) - _EPOCH) // _MILLISECOND
+
+def create_datetime(date_string: str) -> datetime|int:
+    """
+    parses an API timestamp, e.g. "2023-01-02T03:04:05.123Z", into a naive datetime in UTC
+
+    Returns integer milliseconds since the Unix epoch instead when set_epoch_timestamps(True) is on.
+    Recently seen strings are cached, the returned datetimes are immutable so sharing them is safe.
+    """
+    if EPOCH_TIMESTAMPS:
+        return _cached_epoch(date_string)
+    return _cached_datetime(date_string)
+
 #region Schemas
 
+# When enabled, nested collections and timestamps of Mod and File are kept as raw JSON until first accessed
+LAZY_HYDRATION = False
+
+def set_lazy_hydration(enabled: bool) -> None:
+    """ switch lazy hydration of Mod and File on or off for objects created from now on """
+    global LAZY_HYDRATION
+    LAZY_HYDRATION = bool(enabled)
+
+class LazyField(object):
+    """
+    Non-data descriptor for a field that may be left unconverted by Base._set_fields
+
+    The raw JSON value is kept under _raw_<name> and converted on first access, the result is stored
+    in the instance __dict__ which then shadows the descriptor, so later reads are plain attribute lookups.
+    """
+    def __init__(self, convert) -> None:
+        self.convert = convert
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name: str = name
+        self.rawName: str = "_raw_" + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        fields = instance.__dict__
+        try:
+            raw = fields[self.rawName]
+        except KeyError:
+            # another thread converted it in the meantime
+            return fields[self.name]
+        value = fields[self.name] = self.convert(raw)
+        fields.pop(self.rawName, None)
+        return value
+
+def _objects(className: str):
+    """ converter building the schema class className for each dict of a list, the class is looked up on use as it may be defined later in the module """
+    def convert(values, namespace: dict|None = None):
+        cls = (namespace or globals())[className]
+        return list(map(lambda x: cls(**x) if isinstance(x, dict) else x, values))
+    return convert
+
+def _object(className: str):
+    """ converter building the schema class className from a dict """
+    def convert(value, namespace: dict|None = None):
+        return (namespace or globals())[className](**value) if isinstance(value, dict) else value
+    return convert
+
+def _strings(values, namespace: dict|None = None):
+    return list(map(str, values))
+
+def _datetime(value, namespace: dict|None = None):
+    return create_datetime(value) if isinstance(value, str) else value
+
 # Base Class
 class Base(object):
+    __slots__ = ()
+
     def __str__(self):
-        return jsonpickle.dumps(self.__dict__)
-        
+        return self.to_json()
+
+    def to_dict(self) -> dict:
+        """ converts the object into plain JSON-compatible data, enums become their values and datetimes ISO-8601 strings """
+        cls = type(self)
+        serializer = cls.__dict__.get("_serializer")
+        if serializer is None:
+            serializer = _compile_serializer(cls)
+        return serializer.to_dict(self)
+
+    def to_json(self, backend=None) -> str:
+        """ the object as a JSON string, backend is an optional JsonBackend used instead of the json module """
+        if backend is not None:
+            return backend.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """ builds the object from API or to_dict data, keys the constructor does not know are ignored """
+        serializer = cls.__dict__.get("_serializer")
+        if serializer is None:
+            serializer = _compile_serializer(cls)
+        if serializer.fields.issuperset(data):
+            return cls(**data)
+        return cls(**{k: v for k, v in data.items() if k in serializer.fields})
+
+    @classmethod
+    def from_json(cls, data: str|bytes):
+        return cls.from_dict(json.loads(data))
+
+    def _set_fields(self, **values) -> None:
+        """ sets LazyField attributes, converting them now or leaving them raw depending on LAZY_HYDRATION """
+        fields = self.__dict__
+        if LAZY_HYDRATION:
+            for name, value in values.items():
+                fields["_raw_" + name] = value
+        else:
+            cls = type(self)
+            for name, value in values.items():
+                fields[name] = getattr(cls, name).convert(value)
+
+class _Serializer(object):
+    """ the compiled to_dict of a schema class and the names its constructor accepts """
+    def __init__(self, to_dict, fields: frozenset) -> None:
+        self.to_dict = to_dict
+        self.fields: frozenset = fields
+
+_PLAIN_TYPES = frozenset(("int", "str", "bool", "float", "object", "list[int]", "list[str]"))
+
+def _encode_datetime(value):
+    if isinstance(value, datetime):
+        return value.isoformat() + "Z"
+    if isinstance(value, int) and not isinstance(value, bool):
+        # epoch milliseconds, see set_epoch_timestamps
+        return (_EPOCH + value * _MILLISECOND).isoformat() + "Z"
+    return value
+
+def _encode_enum(value):
+    return value.value if isinstance(value, enum.Enum) else value
+
+def _encode_object(value):
+    return value.to_dict() if isinstance(value, Base) else value
+
+def _encode_any(value):
+    """ fallback for fields without a usable annotation """
+    if isinstance(value, Base):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [_encode_any(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _encode_any(v) for k, v in value.items()}
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return _encode_datetime(value)
+    return value
+
+def _field_expression(name: str, annotation: str|None) -> str:
+    """ the source of the expression encoding field name, chosen once from its constructor annotation """
+    value = f"o.{name}"
+    kind = (annotation or "").replace(" ", "")
+    optional = kind.endswith("|None")
+    kind = kind[:-5] if optional else kind
+    many = kind.startswith("list[") and kind.endswith("]")
+    inner = kind[5:-1] if many else kind
+
+    if kind in _PLAIN_TYPES:
+        expression = f"list({value})" if many else value
+    elif inner == "datetime":
+        expression = f"_encode_datetime({value})"
+    elif isinstance(globals().get(inner), type) and issubclass(globals()[inner], enum.Enum):
+        expression = f"[_encode_enum(x) for x in {value}]" if many else f"_encode_enum({value})"
+    elif isinstance(globals().get(inner), type) and issubclass(globals()[inner], Base):
+        expression = f"[_encode_object(x) for x in {value}]" if many else f"_encode_object({value})"
+    else:
+        return f"_encode_any({value})"
+
+    if optional or many:
+        return f"None if {value} is None else {expression}"
+    return expression
+
+def _compile_serializer(cls: type) -> _Serializer:
+    """ generates and caches a to_dict for cls with one precomputed expression per constructor field """
+    # compact classes share their constructor code, but only the original function keeps the annotations
+    init = getattr(cls, "_schema", cls).__init__
+    code = init.__code__
+    fields = code.co_varnames[1:code.co_argcount]
+    annotations = init.__annotations__
+    body = ",\n".join(f"        {name!r}: {_field_expression(name, annotations.get(name))}" for name in fields)
+    source = f"def to_dict(o):\n    return {{\n{body}\n    }}\n"
+    namespace = {
+        "_encode_datetime": _encode_datetime,
+        "_encode_enum": _encode_enum,
+        "_encode_object": _encode_object,
+        "_encode_any": _encode_any,
+    }
+    exec(compile(source, f"<{cls.__name__}.to_dict>", "exec"), namespace)
+    serializer = _Serializer(namespace["to_dict"], frozenset(fields))
+    cls._serializer = serializer
+    return serializer
 
 # ApiResponseOfListOfMinecraftGameVersion Schema
 """
@@ -190,7 +399,7 @@ hashes 	[FileHash] 	The file hash (i.e. md5 or sha1)
 fileDate 	string(date-time) 	The file timestamp
 fileLength 	integer(int64) 	The file length in bytes
 downloadCount 	integer(int64) 	The number of downloads for the file
-downloadUrl 	string 	The file download URL
+downloadUrl 	string 	The file download URL, null when the author does not allow third party downloads
 gameVersions 	[string] 	List of game versions this file is relevant for
 sortableGameVersions 	[SortableGameVersion] 	Metadata used for sorting by game versions
 dependencies 	[FileDependency] 	List of dependencies files
@@ -205,7 +414,13 @@ modules 	[FileModule] 	none
 
 # File Class
 class File(Base):
-    def __init__(self, id: int, gameId: int, modId: int, isAvailable: bool, displayName: str, fileName: str, releaseType: FileReleaseType, fileStatus: FileStatus, hashes: list[FileHash], fileDate: str, fileLength: int, downloadCount: int, downloadUrl: str, gameVersions: list[str], sortableGameVersions: list[SortableGameVersion], dependencies: list[FileDependency], fileFingerprint: int, modules: list[FileModule], exposeAsAlternative: bool | None = None, parentProjectFileId: int | None = None, alternateFileId: int | None = None, isServerPack: bool | None = None, serverPackFileId: int | None = None):
+    hashes: list[FileHash] = LazyField(_objects("FileHash"))
+    gameVersions: list[str] = LazyField(_strings)
+    sortableGameVersions: list[SortableGameVersion] = LazyField(_objects("SortableGameVersion"))
+    dependencies: list[FileDependency] = LazyField(_objects("FileDependency"))
+    modules: list[FileModule] = LazyField(_objects("FileModule"))
+
+    def __init__(self, id: int, gameId: int, modId: int, isAvailable: bool, displayName: str, fileName: str, releaseType: FileReleaseType, fileStatus: FileStatus, hashes: list[FileHash], fileDate: str, fileLength: int, downloadCount: int, downloadUrl: str | None, gameVersions: list[str], sortableGameVersions: list[SortableGameVersion], dependencies: list[FileDependency], fileFingerprint: int, modules: list[FileModule], exposeAsAlternative: bool | None = None, parentProjectFileId: int | None = None, alternateFileId: int | None = None, isServerPack: bool | None = None, serverPackFileId: int | None = None):
         self.id: int = int(id)
         self.gameId: int = int(gameId)
         self.modId: int = int(modId)
@@ -214,21 +429,17 @@ class File(Base):
         self.fileName: str = str(fileName)
         self.releaseType: FileReleaseType = FileReleaseType(releaseType)
         self.fileStatus: FileStatus = FileStatus(fileStatus)
-        self.hashes: list[FileHash] = list(map(lambda x: FileHash(**x) if isinstance(x, dict) else x, hashes))
         self.fileDate: str = str(fileDate)
         self.fileLength: int = int(fileLength)
         self.downloadCount: int = int(downloadCount)
-        self.downloadUrl: str = str(downloadUrl)
-        self.gameVersions: list[str] = list(map(lambda x: str(x), gameVersions))
-        self.sortableGameVersions: list[SortableGameVersion] = list(map(lambda x: SortableGameVersion(**x) if isinstance(x, dict) else x, sortableGameVersions))
-        self.dependencies: list[FileDependency] = list(map(lambda x: FileDependency(**x) if isinstance(x, dict) else x, dependencies))
+        self.downloadUrl: str | None = str(downloadUrl) if downloadUrl is not None else None
+        self._set_fields(hashes=hashes, gameVersions=gameVersions, sortableGameVersions=sortableGameVersions, dependencies=dependencies, modules=modules)
         self.exposeAsAlternative: bool | None = bool(exposeAsAlternative) if exposeAsAlternative is not None else None
         self.parentProjectFileId: int | None = int(parentProjectFileId) if parentProjectFileId is not None else None
         self.alternateFileId: int | None = int(alternateFileId) if alternateFileId is not None else None
         self.isServerPack: bool | None = bool(isServerPack) if isServerPack is not None else None
         self.serverPackFileId: int | None = int(serverPackFileId) if serverPackFileId is not None else None
         self.fileFingerprint: int = int(fileFingerprint)
-        self.modules: list[FileModule] = list(map(lambda x: FileModule(**x) if isinstance(x, dict) else x, modules))
         
 # FileDependency Schema
 """
@@ -470,7 +681,7 @@ class FingerprintsMatchesResult(Base):
         self.isCacheBuilt: bool = bool(isCacheBuilt)
         self.exactMatches: list[FingerprintMatch] = list(map(lambda x: FingerprintMatch(**x) if isinstance(x, dict) else x, exactMatches))
         self.exactFingerprints: list[int] = list(map(int, exactFingerprints))
-        self.partialMatches: list[FingerprintMatch] = partialMatches
+        self.partialMatches: list[FingerprintMatch] = list(map(lambda x: FingerprintMatch(**x) if isinstance(x, dict) else x, partialMatches or []))
         self.partialMatchFingerprints: object = partialMatchFingerprints
         self.installedFingerprints: list[int] = list(map(int, installedFingerprints))
         self.unmatchedFingerprints: list[int] = list(map(int, unmatchedFingerprints)) if unmatchedFingerprints else []
@@ -607,8 +818,8 @@ data 	[Category] 	The response data
 
 # GetCategoriesResponse Class
 class GetCategoriesResponse(Base):
-    def __init__(self, data: Category):
-        self.data: Category = Category(**data) if isinstance(data, dict) else data
+    def __init__(self, data: list[Category]):
+        self.data: list[Category] = list(map(lambda x: Category(**x) if isinstance(x, dict) else x, data))
 
 # GetFeaturedModsResponse Schema
 """
@@ -824,18 +1035,6 @@ class GetModsByIdsListRequestBody(Base):
     def __init__(self, modIds: list[int]):
         self.modIds: list[int] = list(map(int, modIds))
 
-    def __iter__(self):
-        yield from {
-            "modIds": self.modIds
-        }.items()
-    def __repr__(self):
-        return self.__str__()
-    """
-    def __dict__(self):
-        return {
-            'modIds': self.modIds
-        }
-    """
 
 # HashAlgo Schema
 """
@@ -1021,28 +1220,30 @@ thumbsUpCount 	integer(int32) 	The mod's thumbs up count
 
 # Mod Class
 class Mod(Base):
+    links: ModLinks = LazyField(_object("ModLinks"))
+    categories: list[Category] = LazyField(_objects("Category"))
+    authors: list[ModAuthor] = LazyField(_objects("ModAuthor"))
+    logo: ModAsset = LazyField(_object("ModAsset"))
+    screenshots: list[ModAsset] = LazyField(_objects("ModAsset"))
+    latestFiles: list[File] = LazyField(_objects("File"))
+    latestFilesIndexes: list[FileIndex] = LazyField(_objects("FileIndex"))
+    dateCreated: datetime = LazyField(_datetime)
+    dateModified: datetime = LazyField(_datetime)
+    dateReleased: datetime = LazyField(_datetime)
+
     def __init__(self, id: int, gameId: int, name: str, slug: str, links: ModLinks, summary: str, status: ModStatus, downloadCount: int, isFeatured: bool, primaryCategoryId: int, categories: list[Category], authors: list[ModAuthor], logo: ModAsset, screenshots: list[ModAsset], mainFileId: int, latestFiles: list[File], latestFilesIndexes: list[FileIndex], dateCreated: datetime, dateModified: datetime, dateReleased: datetime, gamePopularityRank: int, isAvailable: bool, thumbsUpCount: int, classId: int|None = None, allowModDistribution: bool|None = None):
         self.id: int = int(id)
         self.gameId: int = int(gameId)
         self.name: str = str(name)
         self.slug: str = str(slug)
-        self.links: ModLinks = ModLinks(**links) if isinstance(links, dict) else links
         self.summary: str = str(summary)
         self.status: ModStatus = ModStatus(status)
         self.downloadCount: int = int(downloadCount)
         self.isFeatured: bool = bool(isFeatured)
         self.primaryCategoryId: int = int(primaryCategoryId)
-        self.categories: list[Category] = list(map(lambda i: Category(**i) if isinstance(i, dict) else i, categories))
         self.classId: int|None = int(classId) if classId else None
-        self.authors: list[ModAuthor] = list(map(lambda i: ModAuthor(**i) if isinstance(i, dict) else i, authors))
-        self.logo: ModAsset = ModAsset(**logo) if isinstance(logo, dict) else logo
-        self.screenshots: list[ModAsset] = list(map(lambda i: ModAsset(**i) if isinstance(i, dict) else i, screenshots))
         self.mainFileId: int = int(mainFileId)
-        self.latestFiles: list[File] = list(map(lambda i: File(**i) if isinstance(i, dict) else i, latestFiles))
-        self.latestFilesIndexes: list[FileIndex] = list(map(lambda i: FileIndex(**i) if isinstance(i, dict) else i, latestFilesIndexes))
-        self.dateCreated: datetime = create_datetime(dateCreated) if isinstance(dateCreated, str) else dateCreated
-        self.dateModified: datetime = create_datetime(dateModified) if isinstance(dateModified, str) else dateModified
-        self.dateReleased: datetime = create_datetime(dateReleased) if isinstance(dateReleased, str) else dateReleased
+        self._set_fields(links=links, categories=categories, authors=authors, logo=logo, screenshots=screenshots, latestFiles=latestFiles, latestFilesIndexes=latestFilesIndexes, dateCreated=dateCreated, dateModified=dateModified, dateReleased=dateReleased)
         self.allowModDistribution: bool|None = bool(allowModDistribution) if allowModDistribution is not None else None
         self.gamePopularityRank: int = int(gamePopularityRank)
         self.isAvailable: bool = bool(isAvailable)
@@ -0,0 +1,162 @@
+from CurseForgeAPy.SchemaClasses import Mod
+from bisect import bisect_left, insort
+import heapq
+import re
+import threading
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+def tokenize(text: str) -> list[str]:
+    """ the lowercase words of text, punctuation, dashes and underscores separate words """
+    return _TOKEN.findall(text.casefold()) if text else []
+
+# the cost of ranking a matched mod relative to checking one mod of the ranking for a prefix, about equal
+_SCAN_FACTOR = 1
+
+def _hasPrefix(tokens: tuple[str, ...], prefix: str) -> bool:
+    """ whether any of the sorted tokens starts with prefix, which can only be the first one not below it """
+    i = bisect_left(tokens, prefix)
+    return i < len(tokens) and tokens[i].startswith(prefix)
+
+def _rank(mod: Mod) -> tuple[int, int]:
+    # most downloaded first, then the best (lowest) popularity rank
+    return (-(mod.downloadCount or 0), mod.gamePopularityRank if mod.gamePopularityRank is not None else 1 << 31)
+
+class SearchIndex(object):
+    """
+    In-memory inverted index over the name, slug, summary, author names and category names of Mod objects
+
+    Queries match mods containing every word of the query, the last word matching as a prefix so that partial input
+    can be completed, ranked by downloadCount then gamePopularityRank. Adding a mod that is already indexed replaces it.
+    Thread safe, so it can observe a client whose requests are made from several threads.
+
+        index = SearchIndex()
+        index.attach(cf)  # index every mod cf fetches from now on
+        cf.searchMods(432, searchFilter="jei")
+        index.search("just enou")
+    """
+    def __init__(self) -> None:
+        self.__mods: dict[int, Mod] = {}
+        # the sorted tokens of each mod
+        self.__tokens: dict[int, tuple[str, ...]] = {}
+        self.__postings: dict[str, set[int]] = {}
+        # every indexed token in order, prefixes are contiguous ranges of it
+        self.__vocabulary: list[str] = []
+        # (rank, modId) of every mod, best first, walked instead of the postings when a query matches most mods
+        self.__ranked: list[tuple] = []
+        self.__keys: dict[int, tuple] = {}
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def fields(mod: Mod) -> list[str]:
+        """ the text of mod that is indexed """
+        return [mod.name, mod.slug, mod.summary, *(author.name for author in mod.authors), *(category.name for category in mod.categories)]
+
+    def add(self, mod: Mod) -> None:
+        self.addMany([mod])
+
+    def addMany(self, mods) -> None:
+        """ indexes mods, replacing the earlier version of any already indexed """
+        tokenized = [(mod, tuple(sorted({token for text in self.fields(mod) for token in tokenize(text)}))) for mod in mods]
+        with self.__lock:
+            for mod, tokens in tokenized:
+                self.__remove(mod.id, frozenset(tokens))
+                self.__mods[mod.id] = mod
+                self.__tokens[mod.id] = tokens
+                key = self.__keys[mod.id] = (*_rank(mod), mod.id)
+                insort(self.__ranked, key)
+                for token in tokens:
+                    posting = self.__postings.get(token)
+                    if posting is None:
+                        posting = self.__postings[token] = set()
+                        insort(self.__vocabulary, token)
+                    posting.add(mod.id)
+
+    def remove(self, modId: int) -> None:
+        with self.__lock:
+            self.__remove(int(modId))
+
+    def __remove(self, modId: int, keep: frozenset[str] = frozenset()) -> None:
+        """ unindexes modId, except for the tokens in keep that it is about to be indexed under again """
+        self.__mods.pop(modId, None)
+        key = self.__keys.pop(modId, None)
+        if key is not None:
+            del self.__ranked[bisect_left(self.__ranked, key)]
+        for token in self.__tokens.pop(modId, ()):
+            posting = self.__postings[token]
+            posting.discard(modId)
+            if not posting and token not in keep:
+                del self.__postings[token]
+                del self.__vocabulary[bisect_left(self.__vocabulary, token)]
+
+    def observe(self, response) -> None:
+        """ response hook indexing the mods of any GetModResponse, GetModsResponse, SearchModsResponse or GetFeaturedModsResponse """
+        data = getattr(response, "data", None)
+        if isinstance(data, list):
+            self.addMany(mod for mod in data if hasattr(mod, "slug") and hasattr(mod, "latestFilesIndexes"))
+        elif hasattr(data, "latestFilesIndexes"):
+            self.add(data)
+        elif hasattr(data, "featured"):
+            self.addMany([*data.featured, *data.popular, *data.recentlyUpdated])
+
+    def attach(self, client) -> None:
+        """ indexes every mod client fetches from now on, works with CurseForgeAPI and AsyncCurseForgeAPI """
+        client.responseHooks.append(self.observe)
+
+    def __prefixed(self, prefix: str) -> list[set[int]]:
+        """ the postings of every token starting with prefix """
+        vocabulary = self.__vocabulary
+        postings = []
+        for i in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            token = vocabulary[i]
+            if not token.startswith(prefix):
+                break
+            postings.append(self.__postings[token])
+        return postings
+
+    def __scan(self, prefix: str, limit: int) -> list[Mod]:
+        """ the first limit mods in rank order having a token starting with prefix, quick when most mods have one """
+        tokens = self.__tokens
+        found = []
+        for key in self.__ranked:
+            if _hasPrefix(tokens[key[-1]], prefix):
+                found.append(self.__mods[key[-1]])
+                if len(found) == limit:
+                    break
+        return found
+
+    def search(self, query: str, limit: int = 10) -> list[Mod]:
+        """ the limit best ranked mods matching every word of query, the last one as a prefix """
+        words = tokenize(query)
+        if not words:
+            return []
+        *exact, prefix = words
+        with self.__lock:
+            postings = []
+            for word in exact:
+                posting = self.__postings.get(word)
+                if not posting:
+                    return []
+                postings.append(posting)
+            if postings:
+                # narrow down with the exact words first, smallest posting first, then check the prefix per mod
+                postings.sort(key=len)
+                candidates = set(postings[0]).intersection(*postings[1:])
+                tokens = self.__tokens
+                candidates = [modId for modId in candidates if _hasPrefix(tokens[modId], prefix)]
+            else:
+                prefixed = self.__prefixed(prefix)
+                # ranking the matches costs about as much as the mods matched, walking the ranking about
+                # limit * mods / matched, so short prefixes matching most of the index are walked instead
+                matched = sum(map(len, prefixed))
+                if matched * matched > _SCAN_FACTOR * limit * len(self.__mods):
+                    return self.__scan(prefix, limit)
+                candidates = set().union(*prefixed)
+            best = heapq.nsmallest(limit, candidates, key=self.__keys.__getitem__)
+            return [self.__mods[modId] for modId in best]
+
+    def __len__(self) -> int:
+        return len(self.__mods)
+
+    def __contains__(self, modId: int) -> bool:
+        return modId in self.__mods
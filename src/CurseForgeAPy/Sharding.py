@@ -0,0 +1,221 @@
+from CurseForgeAPy.CFAPI import CurseForgeAPI, DEFAULT_MAX_WORKERS
+from CurseForgeAPy.Endpoints import MAX_PAGE_SIZE, PAGINATION_LIMIT
+from CurseForgeAPy.SchemaClasses import ApiResponseCode, File, Mod, ModLoaderType, ModSearchSortField, SortOrder
+from concurrent.futures import ThreadPoolExecutor
+
+# the order shards are split in, coarse dimensions first so that few probes are needed
+SEARCH_DIMENSIONS = ("classId", "categoryId", "gameVersion", "modLoaderType")
+MOD_FILES_DIMENSIONS = ("gameVersionTypeId", "modLoaderType")
+# dimensions every result has exactly one value of, the others count a mod in several categories, versions or loaders
+DISJOINT_DIMENSIONS = ("classId",)
+
+# the loaders a query can be narrowed to, Any and NoneFound are not filters
+_LOADERS = tuple(loader for loader in ModLoaderType if loader not in (ModLoaderType.Any, ModLoaderType.NoneFound))
+
+class IncompleteResultsError(Exception):
+    """ raised by ShardPlanner.run when the shards returned fewer distinct results than the query has, results holds those they did """
+    def __init__(self, totalCount: int, results: list) -> None:
+        super().__init__(f"expected {totalCount} results, got {len(results)}")
+        self.totalCount: int = totalCount
+        self.results: list = results
+
+class Shard(object):
+    """
+    One sub-query of a ShardPlan
+
+    filters: the keyword arguments of the sub-query, on top of the ones the plan was made for
+
+    totalCount: how many results the shard is responsible for
+
+    limit: how many of them are fetched, at most the pagination limit
+    """
+    def __init__(self, filters: dict, totalCount: int, limit: int) -> None:
+        self.filters: dict = filters
+        self.totalCount: int = totalCount
+        self.limit: int = limit
+
+    @property
+    def complete(self) -> bool:
+        return self.limit >= self.totalCount
+
+    def __repr__(self) -> str:
+        filters = ", ".join(f"{key}={value.name if hasattr(value, 'name') else value}" for key, value in self.filters.items())
+        return f"Shard({filters}, {self.limit}/{self.totalCount})"
+
+class ShardPlan(object):
+    """
+    Sub-queries that together cover a query with more results than the pagination limit lets one query reach
+
+    totalCount: how many results the original query has
+
+    disjoint: whether the query was only split on DISJOINT_DIMENSIONS and sort ranges, so that the shard counts
+    adding up proves they cover it
+
+    complete: whether the shards provably cover the query, every one fitting under the limit and the plan disjoint.
+    When False run may still get every result, it checks
+
+    probes: how many count requests planning took
+    """
+    def __init__(self, fetch, filters: dict, shards: list[Shard], totalCount: int, probes: int, disjoint: bool = True) -> None:
+        self.fetch = fetch
+        self.filters: dict = filters
+        self.shards: list[Shard] = shards
+        self.totalCount: int = totalCount
+        self.probes: int = probes
+        self.disjoint: bool = disjoint
+
+    @property
+    def complete(self) -> bool:
+        return self.disjoint and all(shard.complete for shard in self.shards)
+
+    @property
+    def pages(self) -> int:
+        return sum(-(-shard.limit // MAX_PAGE_SIZE) for shard in self.shards)
+
+    def __repr__(self) -> str:
+        return f"ShardPlan({len(self.shards)} shards, {self.pages} pages, {self.totalCount} results, complete={self.complete})"
+
+class ShardPlanner(object):
+    """
+    Enumerates searchMods and getModFiles results past the 10,000 item pagination limit
+
+    A query whose pagination.totalCount is over the limit is split on each dimension in turn, searchMods on
+    classId, categoryId, gameVersion and modLoaderType, getModFiles on gameVersionTypeId and modLoaderType,
+    each sub-query being split further while it is still over the limit. A split is only kept when its sub-queries
+    add up to at least the results of the query, as a dimension some results have no value for would lose them.
+    That only proves the split covers the query for DISJOINT_DIMENSIONS, a mod in several categories is counted
+    once per category, so a split on any other dimension leaves the plan not disjoint.
+    A searchMods query that cannot be split but has at most twice the limit is read from both ends, sorted by name
+    ascending and descending. Every page of every shard is then fetched concurrently and the results deduplicated
+    by id, run raising IncompleteResultsError when fewer remain than the query has.
+
+    maxWorkers: how many count and page requests may be in flight at once
+
+        planner = ShardPlanner(cf, maxWorkers=8)
+        mods = planner.searchAll(432)
+    """
+    def __init__(self, client: CurseForgeAPI, maxWorkers: int = DEFAULT_MAX_WORKERS, limit: int = PAGINATION_LIMIT) -> None:
+        self.client: CurseForgeAPI = client
+        self.maxWorkers: int = maxWorkers
+        self.limit: int = limit
+        self.__values: dict = {}
+
+    def planSearch(self, gameId: int, dimensions: tuple[str, ...] = SEARCH_DIMENSIONS, **filters) -> ShardPlan|ApiResponseCode:
+        """ shards a searchMods query, filters are searchMods keyword arguments other than index and pageSize """
+        def fetch(shardFilters: dict, index: int, pageSize: int):
+            return self.client.searchMods(gameId, **shardFilters, index=index, pageSize=pageSize)
+        def values(dimension: str, shardFilters: dict) -> list|ApiResponseCode:
+            if dimension == "classId":
+                return self.__cached(("classes", gameId), lambda: self.client.getCategories(gameId, classesOnly=True), lambda data: [category.id for category in data])
+            if dimension == "categoryId":
+                classId = shardFilters.get("classId")
+                return self.__cached(("categories", gameId, classId), lambda: self.client.getCategories(gameId, classId=classId), lambda data: [category.id for category in data if not category.isClass])
+            if dimension == "gameVersion":
+                return self.__cached(("versions", gameId), lambda: self.client.getVersions(gameId), lambda data: list(dict.fromkeys(version for versions in data for version in versions.versions)))
+            return list(_LOADERS)
+        return self.__plan(fetch, values, dimensions, filters, sortable=True)
+
+    def planModFiles(self, modId: int, gameId: int|None = None, dimensions: tuple[str, ...] = MOD_FILES_DIMENSIONS, **filters) -> ShardPlan|ApiResponseCode:
+        """ shards a getModFiles query, gameId is needed to split on gameVersionTypeId """
+        def fetch(shardFilters: dict, index: int, pageSize: int):
+            return self.client.getModFiles(modId, **shardFilters, index=index, pageSize=pageSize)
+        def values(dimension: str, shardFilters: dict) -> list|ApiResponseCode:
+            if dimension == "gameVersionTypeId":
+                if gameId is None:
+                    return []
+                return self.__cached(("versions", gameId), lambda: self.client.getVersions(gameId), lambda data: [versions.type for versions in data])
+            return list(_LOADERS)
+        return self.__plan(fetch, values, dimensions, filters, sortable=False)
+
+    def __cached(self, key: tuple, request, extract) -> list|ApiResponseCode:
+        """ the values of a dimension, requested once per planner """
+        if key not in self.__values:
+            response = request()
+            if isinstance(response, ApiResponseCode):
+                return response
+            self.__values[key] = extract(response.data)
+        return self.__values[key]
+
+    def __plan(self, fetch, values, dimensions: tuple[str, ...], filters: dict, sortable: bool) -> ShardPlan|ApiResponseCode:
+        probes = 0
+        disjoint = True
+        with ThreadPoolExecutor(max_workers=max(1, self.maxWorkers)) as pool:
+            def count(shardFilters: dict) -> int|ApiResponseCode:
+                response = fetch(shardFilters, 0, 1)
+                return response if isinstance(response, ApiResponseCode) else response.pagination.totalCount
+
+            def split(shardFilters: dict, total: int, remaining: tuple[str, ...]) -> list[Shard]|ApiResponseCode:
+                nonlocal probes, disjoint
+                if total <= self.limit:
+                    return [Shard(shardFilters, total, total)]
+                for position, dimension in enumerate(remaining):
+                    if shardFilters.get(dimension) is not None:
+                        continue
+                    candidates = values(dimension, shardFilters)
+                    if isinstance(candidates, ApiResponseCode):
+                        return candidates
+                    children = [{**shardFilters, dimension: value} for value in candidates]
+                    totals = list(pool.map(count, children))
+                    probes += len(children)
+                    failed = next((t for t in totals if isinstance(t, ApiResponseCode)), None)
+                    if failed is not None:
+                        return failed
+                    if sum(totals) < total:
+                        # some results have none of the values, splitting on this dimension would lose them
+                        continue
+                    if dimension not in DISJOINT_DIMENSIONS:
+                        # results counted under several values can make up for results with none
+                        disjoint = False
+                    shards = []
+                    for child, childTotal in zip(children, totals):
+                        if childTotal:
+                            childShards = split(child, childTotal, remaining[position + 1:])
+                            if isinstance(childShards, ApiResponseCode):
+                                return childShards
+                            shards.extend(childShards)
+                    return shards
+                if sortable and total <= 2 * self.limit:
+                    # read the query from both ends, the overlap absorbs results moving while they are read
+                    tail = min(self.limit, total - self.limit + MAX_PAGE_SIZE)
+                    return [Shard({**shardFilters, "sortField": ModSearchSortField.Name, "sortOrder": SortOrder.Ascending}, self.limit, self.limit),
+                            Shard({**shardFilters, "sortField": ModSearchSortField.Name, "sortOrder": SortOrder.Descending}, total - self.limit, tail)]
+                return [Shard(shardFilters, total, self.limit)]
+
+            total = count(filters)
+            probes += 1
+            if isinstance(total, ApiResponseCode):
+                return total
+            shards = split(dict(filters), total, tuple(dimensions))
+        if isinstance(shards, ApiResponseCode):
+            return shards
+        return ShardPlan(fetch, filters, shards, total, probes, disjoint)
+
+    def run(self, plan: ShardPlan) -> list[Mod]|list[File]|ApiResponseCode:
+        """
+        fetches every page of every shard concurrently, returning the results deduplicated by id, or the status of the first failed page
+
+        raises IncompleteResultsError when there are fewer than plan.totalCount of them, as when a shard is over the
+        limit or a split that is not disjoint missed results
+        """
+        pages = [(shard.filters, index, min(MAX_PAGE_SIZE, shard.limit - index)) for shard in plan.shards for index in range(0, shard.limit, MAX_PAGE_SIZE)]
+        with ThreadPoolExecutor(max_workers=max(1, self.maxWorkers)) as pool:
+            responses = list(pool.map(lambda page: plan.fetch(*page), pages))
+        results = {}
+        for response in responses:
+            if isinstance(response, ApiResponseCode):
+                return response
+            for item in response.data:
+                results.setdefault(item.id, item)
+        if len(results) < plan.totalCount:
+            raise IncompleteResultsError(plan.totalCount, list(results.values()))
+        return list(results.values())
+
+    def searchAll(self, gameId: int, **filters) -> list[Mod]|ApiResponseCode:
+        """ every mod matching a searchMods query, however many there are, see run """
+        plan = self.planSearch(gameId, **filters)
+        return plan if isinstance(plan, ApiResponseCode) else self.run(plan)
+
+    def modFilesAll(self, modId: int, gameId: int|None = None, **filters) -> list[File]|ApiResponseCode:
+        """ every file matching a getModFiles query, however many there are, see run """
+        plan = self.planModFiles(modId, gameId, **filters)
+        return plan if isinstance(plan, ApiResponseCode) else self.run(plan)
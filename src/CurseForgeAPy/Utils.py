@@ -1,23 +1,122 @@
 from CurseForgeAPy.CFAPI import CurseForgeAPI
-from CurseForgeAPy.SchemaClasses import FileReleaseType, ApiResponseCode
-from datetime import datetime
+from CurseForgeAPy.Compatibility import ANY_RELEASE_TYPE, CompatibilityIndex
+from CurseForgeAPy.SchemaClasses import FileReleaseType, ApiResponseCode, File, FileHash, HashAlgo, ModLoaderType
+import hashlib
+import os
 
-def downloadFileFromURL(self: CurseForgeAPI, url: str, filename: str):
-    r = self.csesh.get(url, allow_redirects=True)
-    open(filename, 'wb').write(r.content)
-    return ApiResponseCode[r.status_code]
+# downloads are written in chunks of this many bytes, so memory use does not grow with the file size
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# partially downloaded files are kept next to their destination under this suffix until they are complete
+PART_SUFFIX = ".part"
+# the hashlib names of the algorithms CurseForge provides, strongest first
+HASH_ALGORITHMS = {HashAlgo.Sha1: "sha1", HashAlgo.Md5: "md5"}
 
-def downloadFileFromID(self: CurseForgeAPI, id: str, filename: str):
-    return downloadFileFromURL(self.getFiles([id]).data[0]['downloadUrl'], filename)
+class HashMismatchError(Exception):
+    """ raised when a downloaded file does not match its File.hashes, the partial download is deleted """
+    def __init__(self, filename: str, expected: FileHash, actual: str) -> None:
+        super().__init__(f"{filename}: expected {expected.algo.name} {expected.value}, got {actual}")
+        self.filename: str = filename
+        self.expected: FileHash = expected
+        self.actual: str = actual
 
-def downloadFileFromModID(self: CurseForgeAPI, modID: str, filename: str):
+def preferredHash(hashes: list[FileHash]|None) -> FileHash|None:
+    """ the strongest of a File's hashes, only one is computed while downloading """
+    for algo in HASH_ALGORITHMS:
+        for fileHash in hashes or ():
+            if fileHash.algo == algo and fileHash.value:
+                return fileHash
+    return None
+
+def downloadFileFromURL(self: CurseForgeAPI, url: str, filename: str, chunkSize: int = DOWNLOAD_CHUNK_SIZE, resume: bool = True, onChunk=None, hashes: list[FileHash]|None = None) -> ApiResponseCode:
+    """
+    Streams url to filename chunkSize bytes at a time, through self.downloadSession so the file never enters the response cache
+
+    The file is written to filename + ".part" and only renamed onto filename once complete, so filename never holds a partial download.
+    With resume, a .part file left by an interrupted download is continued with an HTTP Range request instead of starting over.
+
+    onChunk: called with the size of every chunk written
+
+    hashes: the File.hashes to verify the download against, the digest is computed from the chunks as they are written
+    (a resumed download reads back only the part already on disk)
+
+    returns ApiResponseCode.OK, or the status of the failed request
+
+    raises HashMismatchError if the downloaded file does not match hashes
+    """
+    part = filename + PART_SUFFIX
+    offset = os.path.getsize(part) if resume and os.path.exists(part) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    with self.downloadSession.get(url, headers=headers, stream=True, allow_redirects=True) as r:
+        if offset and (r.status_code == 416 or r.status_code == 206 and not r.headers.get("Content-Range", "").startswith(f"bytes {offset}-")):
+            # the part file does not fit the remote file any more, e.g. it was replaced, so start over
+            os.remove(part)
+            return downloadFileFromURL(self, url, filename, chunkSize, resume=False, onChunk=onChunk, hashes=hashes)
+        if r.status_code == 206:
+            mode = "ab"
+        elif r.status_code == 200:
+            # no range was requested, or the server ignored it and sent the whole file
+            mode = "wb"
+        else:
+            return ApiResponseCode(r.status_code)
+        expected = preferredHash(hashes)
+        digest = hashlib.new(HASH_ALGORITHMS[expected.algo]) if expected is not None else None
+        if digest is not None and mode == "ab":
+            with open(part, "rb") as f:
+                for chunk in iter(lambda: f.read(chunkSize), b""):
+                    digest.update(chunk)
+        with open(part, mode) as f:
+            for chunk in r.iter_content(chunkSize):
+                f.write(chunk)
+                if digest is not None:
+                    digest.update(chunk)
+                if onChunk is not None:
+                    onChunk(len(chunk))
+    if digest is not None and digest.hexdigest() != expected.value.lower():
+        os.remove(part)
+        raise HashMismatchError(filename, expected, digest.hexdigest())
+    os.replace(part, filename)
+    return ApiResponseCode.OK
+
+def downloadFileFromID(self: CurseForgeAPI, id: int, filename: str) -> ApiResponseCode:
+    response = self.getFiles([id])
+    if isinstance(response, ApiResponseCode):
+        return response
+    if not response.data:
+        return ApiResponseCode.NotFound
+    return _downloadFile(self, response.data[0], filename)
+
+def downloadFileFromModID(self: CurseForgeAPI, modID: int, filename: str) -> ApiResponseCode:
     mod = self.getMod(modID)
-    return downloadFileFromURL(mod.data['latestFiles'][0]['downloadUrl'], filename)
+    if isinstance(mod, ApiResponseCode):
+        return mod
+    if not mod.data.latestFiles:
+        return ApiResponseCode.NotFound
+    return _downloadFile(self, mod.data.latestFiles[0], filename)
 
-def downloadFileFromModIDVersion(self: CurseForgeAPI, modID: str, version: str, filename: str, releaseType: FileReleaseType = FileReleaseType.Release):
-    """ Will only download the first file that matches the version and release type (None for any release type)"""
+def downloadFileFromModIDAndFileID(self: CurseForgeAPI, modID: int, fileID: int, filename: str) -> ApiResponseCode:
+    response = self.getModFile(modID, fileID)
+    if isinstance(response, ApiResponseCode):
+        return response
+    return _downloadFile(self, response.data, filename)
+
+def downloadFileFromModIDVersion(self: CurseForgeAPI, modID: int, version: str, filename: str, releaseType: FileReleaseType|None = FileReleaseType.Release, modLoaderType: ModLoaderType|None = None) -> ApiResponseCode:
+    """ Downloads the newest file for the game version, release type (None for the newest of any) and mod loader (None for any) """
     mod = self.getMod(modID)
-    for file in mod.data['latestFiles']:
-        if version in file.gameVersions and (file.releaseType == releaseType or not releaseType):
-            return downloadFileFromURL(file['downloadUrl'], filename)
-    raise Exception('Version not found matching the given release type.')
\ No newline at end of file
+    if isinstance(mod, ApiResponseCode):
+        return mod
+    index = CompatibilityIndex()
+    index.add(mod.data)
+    fileIndex = index.bestFile(mod.data.id, version, modLoaderType, ANY_RELEASE_TYPE if releaseType is None else (releaseType,))
+    if fileIndex is None:
+        raise Exception('Version not found matching the given release type.')
+    for file in mod.data.latestFiles:
+        if file.id == fileIndex.fileId:
+            return _downloadFile(self, file, filename)
+    # latestFilesIndexes covers more files than latestFiles
+    return downloadFileFromModIDAndFileID(self, modID, fileIndex.fileId, filename)
+
+def _downloadFile(self: CurseForgeAPI, file: File, filename: str) -> ApiResponseCode:
+    if not file.downloadUrl:
+        # the author has disabled third party downloads of this mod
+        return ApiResponseCode.Forbidden
+    return downloadFileFromURL(self, file.downloadUrl, filename, hashes=file.hashes)
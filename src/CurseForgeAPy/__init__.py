@@ -1,8 +1,25 @@
-from .CFAPI import CurseForgeAPI
+from .CFAPI import CurseForgeAPI, ApiResponseError
+from .AsyncCFAPI import AsyncCurseForgeAPI
+from .Coalescer import RequestCoalescer
+from .Memo import ResponseMemo
+from .RateLimiter import RateLimiter
+from .Retry import CircuitBreaker, RetryPolicy
+from .Cache import CachePolicy
+from .Downloader import BulkDownloader, DownloadProgress, DownloadResult
+from .JsonBackend import JsonBackend, get_json_backend
+from . import Fingerprint
+from .Scanner import FingerprintCache, ModsScanner, ScanResult
+from .Resolver import DependencyResolver, InstallPlan
+from .Mirror import CatalogMirror
+from .Sharding import IncompleteResultsError, Shard, ShardPlan, ShardPlanner
+from .Search import SearchIndex
+from .Compatibility import CompatibilityIndex
 
 from .Utils import (
+    HashMismatchError,
     downloadFileFromID, 
     downloadFileFromModID, 
+    downloadFileFromModIDAndFileID,
     downloadFileFromModIDVersion, 
     downloadFileFromURL,
 )
@@ -72,4 +89,7 @@ from .SchemaClasses import (
     SortOrder,
     SortableGameVersion,
     StringResponse,
+    create_datetime,
+    set_epoch_timestamps,
+    set_lazy_hydration,
 )
\ No newline at end of file
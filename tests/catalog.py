@@ -0,0 +1,75 @@
+"""
+An in-memory stand-in for the searchMods, getCategories and getVersions endpoints of CurseForgeAPI
+
+Catalog filters, sorts and pages mods the way the API does, refusing pages past its pagination limit,
+so ShardPlanner and CatalogMirror can be tested without a network.
+"""
+from datetime import datetime, timedelta
+
+from CurseForgeAPy.Endpoints import PAGINATION_LIMIT
+from CurseForgeAPy.JsonBackend import get_json_backend
+from CurseForgeAPy.SchemaClasses import ApiResponseCode, Category, GameVersionsByType, GetCategoriesResponse, GetVersionsResponse, Mod, ModSearchSortField, Pagination, SearchModsResponse, SortOrder
+
+GAME_ID = 432
+VERSIONS = ("1.19.2", "1.20.1")
+NEWEST = datetime(2024, 1, 1)
+
+def category(id: int, classId: int|None = None) -> Category:
+    """ a class when classId is None, otherwise a category of classId """
+    return Category(id, GAME_ID, f"Category {id}", f"category-{id}", "", "", "2014-05-08T17:44:39.057Z",
+                    isClass=classId is None, classId=classId if classId is not None else id, parentCategoryId=classId)
+
+def mod(id: int, classId: int, categories: list[Category] = (), age: int|None = None) -> Mod:
+    """ a mod of classId in categories, last modified age seconds before NEWEST, id seconds by default """
+    dateModified = (NEWEST - timedelta(seconds=id if age is None else age)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return Mod(id, GAME_ID, f"Mod {id:06d}", f"mod-{id}", {"websiteUrl": "", "wikiUrl": "", "issuesUrl": "", "sourceUrl": ""}, "", 4, id, False,
+               categories[0].id if categories else classId, list(categories), [], {"id": id, "modId": id, "title": "", "description": "", "thumbnailUrl": "", "url": ""}, [],
+               id, [], [], "2020-01-01T00:00:00Z", dateModified, dateModified, id, True, 0, classId=classId)
+
+class Catalog(object):
+    """
+    The mods and categories of GAME_ID, searched like CurseForgeAPI.searchMods
+
+    limit: how far searchMods can page, requests past it are answered with BadRequest
+
+    failAt: searchMods call numbers, counted from 1, answered with ServiceUnavailable instead
+    """
+    def __init__(self, mods: list[Mod], categories: list[Category], limit: int = PAGINATION_LIMIT, failAt: tuple[int, ...] = ()) -> None:
+        self.mods: list[Mod] = list(mods)
+        self.categories: list[Category] = list(categories)
+        self.limit: int = limit
+        self.failAt: set[int] = set(failAt)
+        self.calls: int = 0
+        self.searches: list[dict] = []
+        self.json = get_json_backend()
+
+    @staticmethod
+    def __matches(mod: Mod, classId: int|None, categoryId: int|None) -> bool:
+        # every mod is for every version and loader, so gameVersion and modLoaderType never narrow a query
+        return (classId is None or mod.classId == classId) and (categoryId is None or any(category.id == categoryId for category in mod.categories))
+
+    def searchMods(self, gameId: int, classId: int|None = None, categoryId: int|None = None, gameVersion: str|None = None, sortField: ModSearchSortField|None = None, sortOrder: SortOrder|None = None, modLoaderType=None, index: int = 0, pageSize: int = 50, **filters) -> SearchModsResponse|ApiResponseCode:
+        self.calls += 1
+        self.searches.append({"classId": classId, "categoryId": categoryId, "index": index, "pageSize": pageSize})
+        if self.calls in self.failAt:
+            return ApiResponseCode.ServiceUnavailable
+        if index + pageSize > self.limit:
+            return ApiResponseCode.BadRequest
+        mods = [mod for mod in self.mods if mod.gameId == gameId and self.__matches(mod, classId, categoryId)]
+        if sortField == ModSearchSortField.Name:
+            mods.sort(key=lambda mod: mod.name, reverse=sortOrder == SortOrder.Descending)
+        else:
+            mods.sort(key=lambda mod: mod.dateModified, reverse=True)
+        page = mods[index:index + pageSize]
+        return SearchModsResponse(page, Pagination(index, pageSize, len(page), len(mods)))
+
+    def getCategories(self, gameId: int, classId: int|None = None, classesOnly: bool|None = None) -> GetCategoriesResponse:
+        categories = [category for category in self.categories if category.gameId == gameId]
+        if classesOnly:
+            categories = [category for category in categories if category.isClass]
+        if classId is not None:
+            categories = [category for category in categories if category.classId == classId]
+        return GetCategoriesResponse(categories)
+
+    def getVersions(self, gameId: int) -> GetVersionsResponse:
+        return GetVersionsResponse([GameVersionsByType(73407, list(VERSIONS))])
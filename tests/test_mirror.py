@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from CurseForgeAPy import CatalogMirror
+from CurseForgeAPy.Endpoints import PAGINATION_LIMIT
+from CurseForgeAPy.SchemaClasses import ApiResponseCode
+from catalog import GAME_ID, NEWEST, Catalog, category, mod
+
+def millis(age: int) -> int:
+    """ the epoch milliseconds of a mod last modified age seconds before NEWEST """
+    return int((NEWEST - timedelta(seconds=age)).timestamp() * 1000)
+
+def test_interrupted_sync_resumes(tmp_path):
+    catalog = Catalog([mod(i, 6) for i in range(1, 301)], [category(6)], failAt=(3,))
+    mirror = CatalogMirror(catalog, GAME_ID, str(tmp_path / "catalog.sqlite"), pageSize=50)
+
+    assert mirror.sync() == ApiResponseCode.ServiceUnavailable
+    assert len(mirror) == 100 and mirror.checkpoint is None
+
+    catalog.searches.clear()
+    assert mirror.sync() == 200
+    assert catalog.searches[0]["index"] == 100
+    assert len(mirror) == 300 and mirror.checkpoint == millis(1)
+
+    # only what changed since the checkpoint is fetched, the mod at the checkpoint included
+    catalog.mods += [mod(i, 6, age=-i) for i in range(301, 306)]
+    catalog.searches.clear()
+    assert mirror.sync() == 6
+    assert len(catalog.searches) == 1
+    assert len(mirror) == 305 and mirror.checkpoint == millis(-305)
+
+def test_sync_past_pagination_limit_resumes_by_class(tmp_path):
+    tech, magic = category(100, 6), category(101, 6)
+    big = PAGINATION_LIMIT + 500
+    mods = [mod(i, 6, [tech if i % 2 else magic]) for i in range(1, big + 1)] + [mod(i, 12) for i in range(big + 1, big + 1001)]
+    # the 10 pages of the whole game, the 2 class counts, then the third page of class 6 fails
+    catalog = Catalog(mods, [category(6), category(12), tech, magic], failAt=(15,))
+    mirror = CatalogMirror(catalog, GAME_ID, str(tmp_path / "catalog.sqlite"), pageSize=1000)
+
+    assert mirror.sync() == ApiResponseCode.ServiceUnavailable
+    assert len(mirror) == PAGINATION_LIMIT and mirror.checkpoint is None
+
+    catalog.searches.clear()
+    assert mirror.sync() > 0
+    assert (catalog.searches[0]["classId"], catalog.searches[0]["index"]) == (6, 2000)
+    # class 6 is still over the limit, so it is enumerated by category after its crawl, then class 12 is crawled
+    assert any(search["categoryId"] == 100 for search in catalog.searches)
+    assert catalog.searches[-1]["classId"] == 12
+    assert not mirror.truncated
+    assert len(mirror) == len(mods) and mirror.checkpoint == millis(1)
@@ -0,0 +1,47 @@
+import pytest
+
+from CurseForgeAPy import IncompleteResultsError, ShardPlanner
+from catalog import GAME_ID, Catalog, category, mod
+
+LIMIT = 100
+
+def test_over_limit_classes_are_split():
+    classes = [category(6), category(12), category(17)]
+    mods = [mod(i, 6) for i in range(1, 91)] + [mod(i, 12) for i in range(91, 171)] + [mod(i, 17) for i in range(171, 251)]
+    planner = ShardPlanner(Catalog(mods, classes, limit=LIMIT), maxWorkers=4, limit=LIMIT)
+
+    plan = planner.planSearch(GAME_ID)
+
+    assert plan.totalCount == 250
+    assert [shard.filters for shard in plan.shards] == [{"classId": 6}, {"classId": 12}, {"classId": 17}]
+    assert plan.disjoint and plan.complete
+    assert sorted(result.id for result in planner.run(plan)) == list(range(1, 251))
+
+def test_over_limit_class_is_split_on_categories():
+    tech, magic = category(100, 6), category(101, 6)
+    classes = [category(6), category(12), tech, magic]
+    mods = [mod(i, 6, [tech]) for i in range(1, 76)] + [mod(i, 6, [magic]) for i in range(76, 151)] + [mod(i, 12) for i in range(151, 201)]
+    planner = ShardPlanner(Catalog(mods, classes, limit=LIMIT), maxWorkers=4, limit=LIMIT)
+
+    plan = planner.planSearch(GAME_ID)
+
+    assert [shard.filters for shard in plan.shards] == [{"classId": 6, "categoryId": 100}, {"classId": 6, "categoryId": 101}, {"classId": 12}]
+    # a mod can be in several categories, so the counts adding up does not prove the split covers the class
+    assert not plan.disjoint and not plan.complete
+    assert sorted(result.id for result in planner.run(plan)) == list(range(1, 201))
+
+def test_non_disjoint_category_split_raises():
+    tech, magic = category(100, 6), category(101, 6)
+    # 50 mods in both categories are counted twice, making up for the 50 in neither
+    mods = ([mod(i, 6, [tech, magic]) for i in range(1, 51)] + [mod(i, 6, [tech]) for i in range(51, 76)]
+            + [mod(i, 6, [magic]) for i in range(76, 101)] + [mod(i, 6) for i in range(101, 151)])
+    planner = ShardPlanner(Catalog(mods, [category(6), tech, magic], limit=LIMIT), maxWorkers=4, limit=LIMIT)
+
+    plan = planner.planSearch(GAME_ID, classId=6)
+
+    assert [shard.totalCount for shard in plan.shards] == [75, 75]
+    assert not plan.complete
+    with pytest.raises(IncompleteResultsError) as raised:
+        planner.run(plan)
+    assert raised.value.totalCount == 150
+    assert sorted(result.id for result in raised.value.results) == list(range(1, 101))